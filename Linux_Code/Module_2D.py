@@ -2,16 +2,39 @@ import numpy as np
 import time
 from PyQt6.QtWidgets import QMessageBox, QTableView
 
+MIN_VIEW = 50 # values shown at the closest zoom
+TEXT_SYNC = 0.1 # seconds between text view scrolls while the plot is dragged
+
 class Mode2D:
     def __init__(self, ui):
         self.ui = ui
         self.last_page_change_time = 0
         self.is_dragging = False
         self.last_x = 0
+        self.last_text_sync = 0
         self.highlight_enabled = False
 
     def scale_to_fixed_range(self, data, min_val=0, max_val=65535):
-        return [min(max(val, min_val), max_val) for val in data]
+        return np.clip(data, min_val, max_val)
+
+    def view_size(self): # values shown in the plot, one frame until the wheel zooms
+        return self.ui.view_size_2d or self.ui.num_rows * self.ui.columns
+
+    def frame_start(self, index): # first value of the plot showing the index
+        frame = self.ui.num_rows * self.ui.columns
+        view = self.view_size()
+        if view == frame:
+            return (index // frame) * frame
+        return min(max(index - view // 2, 0), max(len(self.ui.image) - view, 0))
+
+    def move_view(self, current_frame, view):
+        # the cursor stays on its value, it is a position in the plot
+        if self.ui.red_line is not None:
+            self.ui.red_line -= current_frame - self.ui.current_frame
+
+        self.ui.current_frame = current_frame
+        self.ui.view_size_2d = view
+        self.ui.redraw.request("2d")
 
     def draw_canvas(self, ui):
         self.ui = ui
@@ -22,44 +45,32 @@ class Mode2D:
         if self.ui.disable_2d_canvas:
             return
 
-        self.ui.ax.clear()
-
+        view = self.view_size()
         start_index = self.ui.current_frame + self.ui.shift_count
-        end_index_mod = min(start_index + self.ui.num_rows * self.ui.columns, len(self.ui.current_values)) + self.ui.shift_count
-        data_unpacked_mod = self.ui.current_values[start_index:end_index_mod]
-
-        data_unpacked = self.ui.unpacked[start_index - self.ui.shift_count:end_index_mod - self.ui.shift_count]
-
-        scaled_data_mod = self.scale_to_fixed_range(data_unpacked_mod)
-        scaled_data = self.scale_to_fixed_range(data_unpacked)
+        end_index = min(self.ui.current_frame + view, len(self.ui.image))
 
-        scaled_data_mod = np.array(scaled_data_mod)
-        scaled_data = np.array(scaled_data)
+        data_unpacked_mod = self.ui.image.current[self.ui.current_frame:end_index]
+        data_unpacked = self.ui.image.original[self.ui.current_frame:end_index]
 
-        mask = scaled_data_mod != scaled_data
+        mask = self.ui.image.diff[self.ui.current_frame:end_index] != 0
 
-        self.ui.ax.plot(scaled_data, color="white", linewidth=0.5)
-
-        if np.any(mask):
-            differing_indices = np.where(mask)[0]
-            segments = np.split(differing_indices, np.where(np.diff(differing_indices) != 1)[0] + 1)
-
-            for segment in segments:
-                start = max(segment[0] - 1, 0)
-                end = min(segment[-1] + 2, len(scaled_data_mod))
-                extended_segment = np.arange(start, end)
+        parts = self.ui.canvas.width()
+        if len(data_unpacked) > 2 * parts: # more values than pixels
+            x, data_unpacked, data_unpacked_mod, mask = self.ui.canvas_2d.decimate(data_unpacked, data_unpacked_mod,
+                                                                                   mask, parts)
+        else:
+            x = np.arange(len(data_unpacked))
 
-                self.ui.ax.plot(extended_segment, scaled_data_mod[extended_segment], color="red", linewidth=0.5)
+        scaled_data_mod = self.scale_to_fixed_range(data_unpacked_mod)
+        scaled_data = self.scale_to_fixed_range(data_unpacked)
 
-        if self.ui.red_line is not None:
-            self.ui.ax.axvline(self.ui.red_line, color="#bd090e", linestyle='-', label="Clicked Position")
+        spans = [] # start, end and color of every highlighted area
 
         if self.ui.display_sel:
-            self.ui.ax.axvspan(self.ui.sel_start, self.ui.sel_end, color="#555", alpha=0.3, label="Selected Area")
+            spans.append((self.ui.sel_start, self.ui.sel_end, "#555"))
 
         start_maps = self.ui.start_index_maps
         end_maps = self.ui.end_index_maps
-        frame = self.ui.num_rows * self.ui.columns
 
         # User created maps
 
@@ -70,43 +81,31 @@ class Mode2D:
             new_start = start - start_index
             new_end = end - start_index
 
-            if 0 <= new_start <= frame and 0 <= new_end <= frame:
-                self.ui.ax.axvspan(new_start, new_end, color="#85d7f2", alpha=0.3, label=f"{self.ui.maps_names[i]}")
+            if new_end >= 0 and new_start <= view: # maps crossing the plot edges are cut off
+                spans.append((max(new_start, 0), min(new_end, view), "#85d7f2"))
 
         # Display -> Potential maps
 
-        start_maps = self.ui.potential_maps_start
-        end_maps = self.ui.potential_maps_end
+        potential_maps = self.ui.potential_maps
+        offset = start_index - self.ui.shift_count # image position of the first plotted value
 
-        found_maps = False
+        first, last = potential_maps.window(offset, offset + view)
 
-        for i in range(len(self.ui.potential_maps_start)):
-            start = start_maps[i]
-            end = end_maps[i]
+        for i in range(first, last):
+            new_start = int(potential_maps.starts[i]) - offset
+            new_end = int(potential_maps.ends[i]) - offset
 
-            new_start = start - start_index
-            new_end = end - start_index
+            spans.append((max(new_start, 0), min(new_end, view), "#01857b"))
 
-            if 0 <= new_end <= frame and 0 <= new_start <= frame:
-                self.ui.ax.axvspan(new_start, new_end, color="#01857b", alpha=0.3,
-                                    label=f"{self.ui.potential_maps_names[i]}")
-                found_maps = True
-            else:
-                if found_maps:
-                    break
+        self.ui.canvas_2d.show(x, scaled_data, scaled_data_mod, mask, spans, self.ui.red_line, end_index - self.ui.current_frame)
+        self.ui.overview_2d.show()
 
         if not self.highlight_enabled and not self.ui.display_sel and not self.ui.sync_2d_scroll: # calibrate text to 2d
-            row = (start_index - self.ui.shift_count) // self.ui.columns
-            index_sel = self.ui.model.index(row + 6, 0)
-            self.ui.table_view.scrollTo(index_sel, QTableView.ScrollHint.PositionAtCenter)
-
-        self.ui.ax.set_xlim(0, len(scaled_data_mod))
-        self.ui.ax.set_ylim(0, 65535)
-
-        self.ui.ax.axis('off')
-        self.ui.ax.grid(True, which='both', color='white', linestyle='-', linewidth=0.5)
-
-        self.ui.canvas.draw()
+            if not self.is_dragging or time.time() - self.last_text_sync >= TEXT_SYNC:
+                self.last_text_sync = time.time()
+                row = (start_index - self.ui.shift_count) // self.ui.columns
+                index_sel = self.ui.model.index(row + 6, 0)
+                self.ui.table_view.scrollTo(index_sel, QTableView.ScrollHint.PositionAtCenter)
 
         if self.ui.return_text:
             self.ui.return_text = False
@@ -114,14 +113,48 @@ class Mode2D:
         self.highlight_enabled = False
 
     def on_canvas_click(self, event):
-        if not self.ui.unpacked:
+        if not len(self.ui.image):
             return
         x_pos = event.xdata
         if x_pos is not None:
+            if event.button == 1: # dragging pans the plot
+                self.is_dragging = True
+                self.last_x = event.x
+
             self.ui.display_sel = False
             self.ui.red_line = int(x_pos)
             self.highlight_text(self.ui.red_line, False)
-            self.draw_canvas(self.ui)
+            self.ui.redraw.request("2d")
+
+    def on_canvas_move(self, event):
+        if not self.is_dragging:
+            return
+
+        view = self.view_size()
+        pixels = self.ui.ax.bbox.width / view # width of one value
+        shift = round((self.last_x - event.x) / pixels)
+        if shift == 0: # moves shorter than a value add up
+            return
+        self.last_x -= shift * pixels
+
+        current_frame = min(max(self.ui.current_frame + shift, 0), max(len(self.ui.image) - view, 0))
+        self.move_view(current_frame, view)
+
+    def on_canvas_release(self, event):
+        if self.is_dragging:
+            self.is_dragging = False
+            self.ui.redraw.request("2d") # the text view follows the last position
+
+    def on_canvas_scroll(self, event): # the wheel zooms around the pointer
+        if event.xdata is None or not len(self.ui.image):
+            return
+
+        view = self.view_size()
+        size = min(max(int(view * (0.5 if event.button == "up" else 2)), MIN_VIEW), len(self.ui.image))
+
+        current_frame = int(self.ui.current_frame + event.xdata - event.xdata * size / view)
+        current_frame = min(max(current_frame, 0), max(len(self.ui.image) - size, 0))
+        self.move_view(current_frame, size)
 
     def highlight_text(self, x, find_on):
         x += self.ui.shift_count
@@ -138,10 +171,7 @@ class Mode2D:
         index = self.ui.model.index(row, col)
         self.ui.table_view.setCurrentIndex(index)
 
-        if not find_on:
-            value = self.ui.current_values[x + self.ui.current_frame]
-        else:
-            value = self.ui.current_values[x]
+        value = self.ui.image.current[value_index - self.ui.shift_count]
 
         self.ui.value_btn_2d.setText(f"Value: {value:05}")
 
@@ -155,10 +185,10 @@ class Mode2D:
         current_time = time.time()
         if current_time - self.last_page_change_time < 0.12:
             return
-        if self.ui.current_frame - self.ui.num_rows * self.ui.columns >= 0:
+        if self.ui.current_frame > 0:
             self.ui.red_line = None
-            self.ui.current_frame -= self.ui.num_rows * self.ui.columns
-            self.draw_canvas(self.ui)
+            self.ui.current_frame = max(self.ui.current_frame - self.view_size(), 0)
+            self.ui.redraw.request("2d")
 
     def next_page(self):
         if not self.ui.file_path:
@@ -168,10 +198,10 @@ class Mode2D:
         current_time = time.time()
         if current_time - self.last_page_change_time < 0.12:
             return
-        if self.ui.current_frame + self.ui.num_rows * self.ui.columns < len(self.ui.unpacked):
+        if self.ui.current_frame + self.view_size() < len(self.ui.image):
             self.ui.red_line = None
-            self.ui.current_frame += self.ui.num_rows * self.ui.columns
-            self.draw_canvas(self.ui)
+            self.ui.current_frame += self.view_size()
+            self.ui.redraw.request("2d")
 
     def fast_movement(self, direction):
         if not self.ui.file_path:
@@ -182,17 +212,18 @@ class Mode2D:
         if current_time - self.last_page_change_time < 0.12:
             return
         self.ui.red_line = None
+        step = max(200 * self.view_size() // (self.ui.num_rows * self.ui.columns), 1) # 200 values at one frame
         if direction == "right":
-            if self.ui.current_frame + 200 < len(self.ui.unpacked):
-                self.ui.current_frame += 200
-                self.draw_canvas(self.ui)
+            if self.ui.current_frame + step < len(self.ui.image):
+                self.ui.current_frame += step
+                self.ui.redraw.request("2d")
         elif direction == "left":
-            self.ui.current_frame -= 200
+            self.ui.current_frame -= step
             if self.ui.current_frame > 0:
-                self.draw_canvas(self.ui)
+                self.ui.redraw.request("2d")
             else:
                 self.ui.current_frame = 0
-                self.draw_canvas(self.ui)
+                self.ui.redraw.request("2d")
 
     def percentage(self, entry, arg):
         if not self.ui.file_path:
@@ -222,8 +253,8 @@ class Mode2D:
                 num = 0
         if 0 <= num <= 100:
             self.ui.red_line = None
-            self.ui.current_frame = int((len(self.ui.unpacked) - self.ui.num_rows * self.ui.columns) * (num / 100))
-            self.draw_canvas(self.ui)
+            self.ui.current_frame = max(int((len(self.ui.image) - self.view_size()) * (num / 100)), 0)
+            self.ui.redraw.request("2d")
 
     def text_to_2d(self, ui):
         if not self.ui.text_addons.check_selection_consecutive():
@@ -231,38 +262,27 @@ class Mode2D:
             return
 
         self.ui = ui
-        selection_model = self.ui.table_view.selectionModel()
-        selected_indexes = selection_model.selectedIndexes()
-        selected_indexes_count = len(selection_model.selectedIndexes())
+        selected_indexes_count = self.ui.text_addons.selected_count()
 
         if selected_indexes_count == 1:
             self.ui.display_sel = False
-            item = selected_indexes[0]
-            row = item.row()  # current row
-            col = item.column()  # current column
+            row, col = self.ui.text_addons.first_selected()
 
             index = row * self.ui.columns + col - self.ui.shift_count
-            frame = self.ui.num_rows * self.ui.columns
-            frames_num = index // frame
-            self.ui.current_frame = frames_num * frame
+            self.ui.current_frame = self.frame_start(index)
 
             self.ui.red_line = int(index) - self.ui.current_frame
 
             self.highlight_text(index, True)
 
-            value = self.ui.current_values[index + self.ui.shift_count]
+            value = self.ui.image.current[index]
             self.ui.value_btn_2d.setText(f"Value: {value:05}")
 
         if selected_indexes_count > 1:
-            first_item = selected_indexes[0]
-
-            first_row = first_item.row()
-            first_col = first_item.column()
+            first_row, first_col = self.ui.text_addons.first_selected()
 
             index = first_row * self.ui.columns + first_col - self.ui.shift_count
-            frame = self.ui.num_rows * self.ui.columns
-            frames_num = index // frame
-            self.ui.current_frame = frames_num * frame
+            self.ui.current_frame = self.frame_start(index)
 
             if self.ui.current_frame > 0:
                 self.ui.sel_start = int(index) - self.ui.current_frame
@@ -277,7 +297,7 @@ class Mode2D:
 
             self.ui.value_btn_2d.setText(f"Value: 00000")
 
-        self.draw_canvas(self.ui)
+        self.ui.redraw.request("2d")
 
     def on_key_press_2d(self, event):
         pressed_key = event.key
@@ -292,76 +312,35 @@ class Mode2D:
             self.prev_page()
 
     def value_changes_skipping(self, forward):
-        selection_model = self.ui.table_view.selectionModel()
-        selected_indexes = selection_model.selectedIndexes()
+        first_selected = self.ui.text_addons.first_selected()
 
-        if not selected_indexes:
+        if first_selected is None:
             return
 
-        found_value_index = None
-
-        selected_index = selected_indexes[0]
-
-        if not selected_indexes:
-            QMessageBox.warning(self.ui, "Warning", "Please select a number!")
-            return
+        row, col = first_selected
 
-        row = selected_index.row()
-        col = selected_index.column()
+        index = (row * self.ui.columns) + col - self.ui.shift_count
 
-        index = (row * self.ui.columns) + col
-
-        if forward:
-            for i in range(index + 1, len(self.ui.current_values)):
-                if self.ui.current_values[i] != self.ui.unpacked[i - self.ui.shift_count] and self.ui.current_values[i] is not None:
-                    found_value_index = i
-                    while self.ui.current_values[i] != self.ui.unpacked[i - self.ui.shift_count] and self.ui.current_values[i] is not None:
-                        found_value_index += 1
-                        i += 1
-                    found_value_index -= 1
-                    break
-        else:
-            for i in range(index - 1, -1, -1):
-                if self.ui.current_values[i] != self.ui.unpacked[i - self.ui.shift_count] and self.ui.current_values[i] is not None:
-                    found_value_index = i
-                    while self.ui.current_values[i] != self.ui.unpacked[i - self.ui.shift_count] and self.ui.current_values[i] is not None:
-                        found_value_index -= 1
-                        i -= 1
-                    found_value_index += 1
-                    break
+        # end of the next changed block, or start of the previous one
+        runs = self.ui.image.runs
+        found_value_index = runs.next_end(index) if forward else runs.previous_start(index)
 
         if found_value_index is None:
             QMessageBox.warning(self.ui, "Warning", "No values found!")
             return
 
-        self.ui.mode2d.highlight_text(found_value_index - self.ui.shift_count, True)
+        self.ui.mode2d.highlight_text(found_value_index, True)
         self.ui.mode2d.text_to_2d(self.ui)
 
     def first_last_changed_value(self, first):
-        found_value_index = None
-
-        if first:
-            for i in range(0, len(self.ui.current_values)):
-                if self.ui.current_values[i] != self.ui.unpacked[i - self.ui.shift_count] and self.ui.current_values[i] is not None:
-                    found_value_index = i
-                    while self.ui.current_values[i] != self.ui.unpacked[i - self.ui.shift_count] and self.ui.current_values[i] is not None:
-                        found_value_index += 1
-                        i += 1
-                    found_value_index -= 1
-                    break
-        else:
-            for i in range(len(self.ui.current_values) - 1, -1, -1):
-                if self.ui.current_values[i] != self.ui.unpacked[i - self.ui.shift_count] and self.ui.current_values[i] is not None:
-                    found_value_index = i
-                    while self.ui.current_values[i] != self.ui.unpacked[i - self.ui.shift_count] and self.ui.current_values[i] is not None:
-                        found_value_index -= 1
-                        i += 1
-                    found_value_index += 1
-                    break
+        runs = self.ui.image.runs
 
-        if found_value_index is None:
+        if not len(runs):
             QMessageBox.warning(self.ui, "Warning", "No values found!")
             return
 
-        self.ui.mode2d.highlight_text(found_value_index - self.ui.shift_count, True)
+        # end of the first changed block, or start of the last one
+        found_value_index = int(runs.ends[0]) if first else int(runs.starts[-1])
+
+        self.ui.mode2d.highlight_text(found_value_index, True)
         self.ui.mode2d.text_to_2d(self.ui)
\ No newline at end of file
@@ -1,6 +0,0 @@
-from setuptools import setup
-from Cython.Build import cythonize
-
-setup(
-    ext_modules=cythonize("column_transform_module.pyx"),
-)
\ No newline at end of file
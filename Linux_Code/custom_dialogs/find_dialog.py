@@ -110,8 +110,6 @@ class FindDialog(QDialog):
         self.setLayout(layout)
 
     def find_value(self):
-        value_found = False
-        found_value_index = 0
         text = self.find_entry.text()
         if ',' in text:
             try:
@@ -129,12 +127,6 @@ class FindDialog(QDialog):
             except ValueError:
                 QMessageBox.warning(self.ui, "Warning", "Please enter valid numbers!")
                 return
-
-            for i in range(len(self.ui.current_values)):
-                if tuple(self.ui.current_values[i:i + len(int_values)]) == int_values:
-                    found_value_index = i
-                    value_found = True
-                    break
         else:
             try:
                 value = int(text)
@@ -144,20 +136,18 @@ class FindDialog(QDialog):
                 QMessageBox.warning(self.ui, "Warning", "Please enter a valid number!")
                 return
 
-            for i in range(len(self.ui.current_values)):
-                if self.ui.current_values[i] == value:
-                    found_value_index = i
-                    value_found = True
-                    break
+            int_values = (value,)
+
+        found_value_index = self.ui.image.find(int_values)
 
-        if not value_found:
+        if found_value_index is None:
             QMessageBox.warning(self.ui, "Warning", "No matching value was found.")
             return
 
         selection_model = self.ui.table_view.selectionModel()
         selection_model.clearSelection()
 
-        self.ui.mode2d.highlight_text(found_value_index - self.ui.shift_count, True)
+        self.ui.mode2d.highlight_text(found_value_index, True)
         self.ui.mode2d.text_to_2d(self.ui)
 
     def find_move(self, previous):
@@ -187,60 +177,35 @@ class FindDialog(QDialog):
                 QMessageBox.warning(self.ui, "Warning", "Please enter a valid number!")
                 return
 
-        selection_model = self.ui.table_view.selectionModel()
-        selected_indexes = selection_model.selectedIndexes()
+            int_values = (value,)
 
-        if not selected_indexes:
+        first_selected = self.ui.text_addons.first_selected()
+
+        if first_selected is None:
             visible_rect = self.ui.table_view.viewport().geometry()
             first_visible_row = self.ui.table_view.indexAt(visible_rect.topLeft()).row()
 
             index = first_visible_row * self.ui.columns
         else:
-            selected_index = selected_indexes[0]
-            row = selected_index.row()
-            col = selected_index.column()
+            row, col = first_selected
 
             index = (row * self.ui.columns) + col
 
-        value_found = False
-
-        found_value_index = 0
+        index -= self.ui.shift_count # position in the image
 
         if previous:
-            if ',' in text:
-                for i in range(index - 1, -1, -1):
-                    if tuple(self.ui.current_values[i:i + len(int_values)]) == int_values:
-                        found_value_index = i
-                        value_found = True
-                        break
-            else:
-                for i in range(index - 1, -1, -1):
-                    if self.ui.current_values[i] == value:
-                        found_value_index = i
-                        value_found = True
-                        break
+            found_value_index = self.ui.image.find(int_values, index - 1, True)
         else:
-            if ',' in text:
-                for i in range(index + 1, len(self.ui.current_values)):
-                    if tuple(self.ui.current_values[i:i + len(int_values)]) == int_values:
-                        found_value_index = i
-                        value_found = True
-                        break
-            else:
-                for i in range(index + 1, len(self.ui.current_values)):
-                    if self.ui.current_values[i] == value:
-                        found_value_index = i
-                        value_found = True
-                        break
-
-        if not value_found:
+            found_value_index = self.ui.image.find(int_values, index + 1)
+
+        if found_value_index is None:
             QMessageBox.warning(self.ui, "Warning", "No matching value was found.")
             return
 
         selection_model = self.ui.table_view.selectionModel()
         selection_model.clearSelection()
 
-        self.ui.mode2d.highlight_text(found_value_index - self.ui.shift_count, True)
+        self.ui.mode2d.highlight_text(found_value_index, True)
         self.ui.mode2d.text_to_2d(self.ui)
 
     def edit_pasted_values(self):
@@ -1,5 +1,7 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QMessageBox, QApplication
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QMessageBox, QApplication, \
+    QComboBox
 from PyQt6.QtCore import Qt
+from value_operations.value_operations import OPERATIONS, POLICIES
 
 class ValueDialog(QDialog):
     def __init__(self, ui=None):
@@ -33,7 +35,7 @@ class ValueDialog(QDialog):
                 """
 
         self.setWindowTitle("Value Changer")
-        self.setFixedSize(250, 150)
+        self.setFixedSize(300, 190)
         self.setStyleSheet("background-color: #333;")
 
         screen = QApplication.primaryScreen()
@@ -61,12 +63,14 @@ class ValueDialog(QDialog):
         main_layout.addWidget(self.entry)
 
         button_layout = QHBoxLayout()
+        button_layout_2 = QHBoxLayout()
 
         buttons = [
             ("=", self.change_value),
             ("+", self.change_value),
             ("-", self.change_value),
-            ("%", self.change_value)
+            ("%", self.change_value),
+            ("*", self.change_value)
         ]
         for text, func in buttons:
             button = QPushButton(text, self)
@@ -74,7 +78,27 @@ class ValueDialog(QDialog):
             button.clicked.connect(lambda checked, val=text, btn=button: func(val, btn))
             button_layout.addWidget(button)
 
+        for text in ("Clamp", "Lin"):
+            button = QPushButton(text, self)
+            button.setStyleSheet(button_style)
+            button.clicked.connect(lambda checked, val=text, btn=button: self.change_value(val, btn))
+            button_layout_2.addWidget(button)
+
+        self.policy = QComboBox(self) # what happens to results outside of 0 - 65535
+        self.policy.addItems(POLICIES)
+        self.policy.setStyleSheet("""
+            border-radius: 5px;
+            font-family: 'Roboto';
+            font-size: 12px;
+            font-weight: 650;
+            background-color: #555;
+            color: white;
+            padding: 4px;
+        """)
+        button_layout_2.addWidget(self.policy)
+
         main_layout.addLayout(button_layout)
+        main_layout.addLayout(button_layout_2)
 
         ok_button = QPushButton("Ok", self)
         ok_button.setStyleSheet(button_style)
@@ -87,6 +111,14 @@ class ValueDialog(QDialog):
             self.selected_button.setEnabled(True)
         self.selected_button = button
         self.selected_button.setEnabled(False)
+
+        if value == "Clamp":
+            self.entry.setPlaceholderText("lowest highest")
+        elif value == "Lin":
+            self.entry.setPlaceholderText("first last (optional)")
+        else:
+            self.entry.setPlaceholderText("")
+
     def calculate(self):
         if not self.selected_value:
             entry_message = ""
@@ -95,13 +127,13 @@ class ValueDialog(QDialog):
             self.show_error(f"Please select an operation {entry_message}!")
             return
 
-        if self.entry.text() == "":
+        if self.entry.text() == "" and 0 not in OPERATIONS[self.selected_value]:
             self.show_error("Please enter a value in the entry box!")
             return
 
         try:
-            value = float(self.entry.text())
-            if value < 0 or value > 65535:
+            operands = [float(text) for text in self.entry.text().split()]
+            if any(value < 0 or value > 65535 for value in operands):
                 raise ValueError
         except ValueError:
             self.show_error("Please enter a valid number")
@@ -112,22 +144,13 @@ class ValueDialog(QDialog):
             self.close()
             return
 
-        selection_model = self.ui.table_view.selectionModel()
-        selected_indexes = selection_model.selectedIndexes()
-
-        for item in selected_indexes:
-            if item.data() is None or not item.data():
-                self.show_error("Please select valid cells!")
-                return
-
-        if self.selected_value == "=":
-            self.ui.text_addons.set_text(value)
-        elif self.selected_value == "+":
-            self.ui.text_addons.increase_selected_text(value)
-        elif self.selected_value == "-":
-            self.ui.text_addons.increase_selected_text(value * -1)
-        elif self.selected_value == "%":
-            self.ui.text_addons.increase_selected_text_per(value)
+        # every selected cell has to hold a value of the file
+        if self.ui.text_addons.selected_count() != len(self.ui.text_addons.selected_image_indexes()):
+            self.show_error("Please select valid cells!")
+            return
+
+        if not self.ui.text_addons.apply_operation(self.selected_value, operands, self.policy.currentText()):
+            return # keep the dialog open, the value or the overflow policy can be changed
 
         self.ui.dialog_terminate = False
         self.close()
@@ -0,0 +1,52 @@
+import numpy as np
+from image_buffer.image_patch import run_indexes
+
+
+def find_runs(changed, offset=0):
+    # first and last index of every block of True values, shifted by offset
+    padded = np.zeros(len(changed) + 2, dtype=bool)
+    padded[1:-1] = changed
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges[0::2] + offset, edges[1::2] - 1 + offset
+
+
+class ChangeRuns:
+    # sorted, non-touching [start, end] blocks of changed values, kept next to the diff so finding the next
+    # change is a binary search instead of a scan over the image
+    def __init__(self):
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.ends = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def rebuild(self, diff):
+        self.starts, self.ends = find_runs(diff != 0)
+
+    def update(self, diff, first, last): # values from first to last were written
+        # runs touching the written values can grow, split, join or vanish, they are found again
+        i = int(np.searchsorted(self.ends, first - 1))
+        j = int(np.searchsorted(self.starts, last + 1, side='right'))
+        if i < j:
+            first = min(first, int(self.starts[i]))
+            last = max(last, int(self.ends[j - 1]))
+
+        starts, ends = find_runs(diff[first:last + 1] != 0, first)
+        if len(starts) == j - i: # usually an edit inside a changed block, the arrays keep their size
+            self.starts[i:j] = starts
+            self.ends[i:j] = ends
+            return
+
+        self.starts = np.concatenate((self.starts[:i], starts, self.starts[j:]))
+        self.ends = np.concatenate((self.ends[:i], ends, self.ends[j:]))
+
+    def indexes(self): # index of every changed value
+        return run_indexes(self.starts, self.ends - self.starts + 1)
+
+    def next_end(self, index): # last value of the first run reaching past the index, or None
+        i = int(np.searchsorted(self.ends, index + 1))
+        return int(self.ends[i]) if i < len(self.ends) else None
+
+    def previous_start(self, index): # first value of the last run starting before the index, or None
+        i = int(np.searchsorted(self.starts, index - 1, side='right')) - 1
+        return int(self.starts[i]) if i >= 0 else None
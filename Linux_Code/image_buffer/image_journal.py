@@ -0,0 +1,76 @@
+import numpy as np
+
+
+class ImageJournal:
+    def __init__(self, image, max_bytes=64 * 1024 * 1024):
+        self.image = image
+        self.max_bytes = max_bytes # oldest actions are dropped above this size
+        self.undo_stack = [] # actions, every action is a list of (indexes, old values, new values)
+        self.redo_stack = []
+        self.size = 0 # bytes held by both stacks
+
+    @staticmethod
+    def compact(indexes, length):
+        # single values and contiguous index arrays are stored as slices
+        if isinstance(indexes, slice):
+            return slice(*indexes.indices(length))
+        if isinstance(indexes, (int, np.integer)):
+            return slice(int(indexes), int(indexes) + 1)
+
+        indexes = np.asarray(indexes, dtype=np.int64)
+        if len(indexes) and indexes[-1] - indexes[0] + 1 == len(indexes) and np.all(np.diff(indexes) == 1):
+            return slice(int(indexes[0]), int(indexes[-1]) + 1)
+        return indexes
+
+    @staticmethod
+    def bounds(indexes): # first and last index of compacted indexes, or None when empty
+        if isinstance(indexes, slice):
+            return (indexes.start, indexes.stop - 1) if indexes.stop > indexes.start else None
+        return (int(indexes.min()), int(indexes.max())) if len(indexes) else None
+
+    @staticmethod
+    def delta_size(delta):
+        indexes, old_values, new_values = delta
+        return old_values.nbytes + new_values.nbytes + (0 if isinstance(indexes, slice) else indexes.nbytes)
+
+    def record(self, indexes, old_values, new_values):
+        self.push([(indexes, old_values, new_values)])
+
+    def push(self, action):
+        self.size -= sum(self.delta_size(delta) for redo_action in self.redo_stack for delta in redo_action)
+        self.redo_stack = []
+
+        self.undo_stack.append(action)
+        self.size += sum(self.delta_size(delta) for delta in action)
+
+        while self.size > self.max_bytes and len(self.undo_stack) > 1:
+            self.size -= sum(self.delta_size(delta) for delta in self.undo_stack.pop(0))
+
+    def apply(self, action, undo):
+        # old and new values keep the byte order they were recorded in, viewing them in the
+        # current byte order restores the exact bytes even after a Lo-Hi/Hi-Lo switch
+        low, high = len(self.image), -1
+        for indexes, old_values, new_values in (reversed(action) if undo else action):
+            values = old_values if undo else new_values
+            self.image.current[indexes] = values.view(self.image.current.dtype)
+            self.image.update_diff(indexes)
+
+            changed = self.bounds(indexes)
+            if changed is not None:
+                low, high = min(low, changed[0]), max(high, changed[1])
+
+        return (low, high) if high >= low else None
+
+    def undo(self): # returns the first and last changed image index, or None
+        if not self.undo_stack:
+            return None
+        action = self.undo_stack.pop()
+        self.redo_stack.append(action)
+        return self.apply(action, True)
+
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        action = self.redo_stack.pop()
+        self.undo_stack.append(action)
+        return self.apply(action, False)
@@ -0,0 +1,28 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class ImageLoader(QThread):
+    progress = pyqtSignal(int, str) # percent (-1 while the length of a stage is unknown), stage text
+    loaded = pyqtSignal(object) # mapped image buffer
+    failed = pyqtSignal(str) # error text
+
+    def __init__(self, file_path, low_high, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.low_high = low_high
+
+    def run(self):
+        from image_buffer.image_buffer import ImageBuffer
+
+        self.progress.emit(-1, "Opening file") # mapping the file has no progress to show
+        image = ImageBuffer()
+        try:
+            image.open(self.file_path, self.low_high)
+        except (OSError, ValueError) as e:
+            self.failed.emit(str(e))
+            return
+
+        if self.isInterruptionRequested():
+            return
+
+        self.loaded.emit(image) # potential maps are searched from here on
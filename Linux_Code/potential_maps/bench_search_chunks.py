@@ -0,0 +1,78 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from find_maps import find_potential_maps, search_chunks
+
+# times the sequential search against search_chunks at several worker counts and chunk sizes, every chunked
+# result must be the sequential one, maps crossing chunk borders are where they could differ
+# python bench_search_chunks.py [image.bin]     (run next to the built find_maps module)
+
+WORKERS = (1, 2, 4, 8, 16)
+CHUNK_SIZES = (4099, 1 << 16, 1 << 18, 1 << 20) # an odd size puts the borders at every offset into the maps
+REPEATS = 3
+
+
+def random_image(size, seed=0):
+    # noise with smooth maps behind rising axes, many of them cross the chunk borders
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 65535, size, dtype=np.uint16)
+    position = 0
+    while position < size:
+        position += int(rng.integers(0, 2000)) # some maps follow each other directly
+        y_axis, x_axis = int(rng.integers(8, 18)), int(rng.integers(8, 18))
+        axes = np.concatenate((500 + np.arange(y_axis) * 100, np.arange(x_axis) * 50))
+        block = np.concatenate((axes, rng.integers(0, 1000, y_axis * x_axis)))
+        values[position:position + len(block)] = block[:max(size - position, 0)]
+        position += len(block)
+    return values
+
+
+def best_time(function):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def chunked(values, map_chunks, chunk_size):
+    maps_start, maps_end = [], []
+    for starts, ends, searched in search_chunks(values, map_chunks, chunk_size):
+        maps_start.extend(starts)
+        maps_end.extend(ends)
+    return maps_start, maps_end
+
+
+def main():
+    if len(sys.argv) > 1:
+        values = np.fromfile(sys.argv[1], dtype='<u2')
+    else:
+        values = random_image(8 << 20)
+
+    sequential, expected = best_time(lambda: find_potential_maps(values))
+    print(f"{len(values)} values, {len(expected[0])} maps, sequential {sequential * 1000:.1f} ms")
+
+    starts, ends = np.array(expected[0], dtype=np.int64), np.array(expected[1], dtype=np.int64)
+    for chunk_size in CHUNK_SIZES:
+        crossing = np.count_nonzero(starts // chunk_size != ends // chunk_size)
+        print(f"chunks of {chunk_size}, {crossing} maps cross a chunk border")
+        for workers in WORKERS:
+            with ThreadPoolExecutor(workers) as executor:
+                elapsed, result = best_time(lambda: chunked(values, executor.map, chunk_size))
+            assert result == expected, f"chunks of {chunk_size} with {workers} workers found other maps"
+            print(f"chunks of {chunk_size:>8} {workers:>3} workers {elapsed * 1000:8.1f} ms {sequential / elapsed:5.2f}x")
+
+        # also the serial chunk walk, the border handling without threads
+        elapsed, result = best_time(lambda: chunked(values, map, chunk_size))
+        assert result == expected, f"chunks of {chunk_size} without threads found other maps"
+        print(f"chunks of {chunk_size:>8}  no threads {elapsed * 1000:8.1f} ms {sequential / elapsed:5.2f}x")
+
+    print("all chunked searches found the sequential maps")
+
+
+if __name__ == "__main__":
+    main()
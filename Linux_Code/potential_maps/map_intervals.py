@@ -0,0 +1,55 @@
+import numpy as np
+
+
+class MapIntervals:
+    # potential maps as sorted, non-overlapping [start, end] image positions, the text view shift is not
+    # stored and added by the caller when a display position is needed
+    def __init__(self, starts=(), ends=()):
+        self.set(starts, ends)
+
+    def set(self, starts, ends, scores=None):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.scores = np.zeros(len(self.starts)) if scores is None else np.asarray(scores, dtype=np.float64)
+        self.ids = np.arange(len(self.starts), dtype=np.int64) # numbers in the map names, kept on removal
+        self.next_id = len(self.starts)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def name(self, i):
+        return f"Potential Map {self.ids[i]}"
+
+    def find(self, position): # index of the map covering the image position, or None
+        i = int(np.searchsorted(self.ends, position))
+        if i < len(self.starts) and self.starts[i] <= position:
+            return i
+        return None
+
+    def index(self, map_id): # index of the map with the number, or None when it was removed
+        found = np.flatnonzero(self.ids == map_id)
+        return int(found[0]) if len(found) else None
+
+    def ranked(self): # map indexes, highest score first
+        return np.argsort(-self.scores, kind='stable')
+
+    def window(self, low, high): # index range of the maps overlapping the image positions [low, high]
+        return int(np.searchsorted(self.ends, low)), int(np.searchsorted(self.starts, high, side='right'))
+
+    def remove(self, i):
+        keep = np.ones(len(self.starts), dtype=bool)
+        keep[i] = False
+        self.starts, self.ends, self.ids = self.starts[keep], self.ends[keep], self.ids[keep]
+        self.scores = self.scores[keep]
+
+    def replace(self, first, last, starts, ends, scores): # maps [first:last] are replaced by new ones
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float64)
+        ids = np.arange(self.next_id, self.next_id + len(starts), dtype=np.int64)
+        self.next_id += len(starts)
+
+        self.starts = np.concatenate((self.starts[:first], starts, self.starts[last:]))
+        self.ends = np.concatenate((self.ends[:first], ends, self.ends[last:]))
+        self.ids = np.concatenate((self.ids[:first], ids, self.ids[last:]))
+        self.scores = np.concatenate((self.scores[:first], scores, self.scores[last:]))
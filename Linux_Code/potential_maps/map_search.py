@@ -0,0 +1,60 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QThread, pyqtSignal
+from potential_maps.search_module import find_maps
+
+PARALLEL_MIN_SIZE = 2 << 20 # values, smaller images are searched faster in one go
+
+
+class MapSearch(QThread):
+    progress = pyqtSignal(int, str) # percent (-1 while the length of a stage is unknown), stage text
+    found = pyqtSignal(object, object, object) # start indexes, end indexes and scores of the next maps in order
+
+    def __init__(self, image, cached, parent=None):
+        super().__init__(parent)
+        self.image = image
+        self.cached = cached # search the original values, results of files opened before are reused
+        self.complete = False # every map was found, not canceled
+
+    def run(self):
+        from potential_maps.maps_cache import MapsCache
+        from potential_maps.map_scoring import score_maps
+
+        values = self.image.original if self.cached else self.image.current
+
+        if self.cached:
+            self.progress.emit(-1, "Looking for searched maps") # the whole file is hashed for the cache key
+            cache = MapsCache()
+            key = cache.key(self.image, find_maps.VERSION)
+
+            maps = cache.get(key)
+            if maps is not None:
+                self.found.emit(maps[0], maps[1], score_maps(values, *maps))
+                self.complete = True
+                return
+
+        self.progress.emit(0, "Searching potential maps")
+        maps_start, maps_end = [], []
+
+        # the search releases the GIL, threads run the chunks on all cores
+        workers = os.cpu_count() or 1
+        executor = ThreadPoolExecutor(workers) if workers > 1 and len(values) >= PARALLEL_MIN_SIZE else None
+
+        try:
+            for starts, ends, searched in find_maps.search_chunks(values, executor.map if executor else map):
+                if self.isInterruptionRequested():
+                    return
+
+                if starts:
+                    maps_start.extend(starts)
+                    maps_end.extend(ends)
+                    self.found.emit(starts, ends, score_maps(values, starts, ends))
+
+                self.progress.emit(searched * 100 // len(values), "Searching potential maps")
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        if self.cached:
+            cache.put(key, maps_start, maps_end)
+        self.complete = True
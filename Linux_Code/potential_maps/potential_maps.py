@@ -1,16 +1,194 @@
-import sys
-import os
+import numpy as np
+from potential_maps.search_module import find_maps
+
+AXES_SIZE = 35 # values read from a search position, two axes of up to 17 values and the value behind them
 
 class Potential_maps_manager:
     def __init__(self, ui):
         self.ui = ui
+        self.ready = False # maps of the open image were searched, edits are searched again from then on
+        self.pending = None # first and last image index edited before the search finished
+        self.search_thread = None # background search of the open image
+        self.suppressed = set() # (start, end) of maps the user removed, searches do not bring them back
+        self.pruned = set() # (start, end) of found maps scoring too low to be highlighted, listed last
+
+    def start_search(self, cached):
+        # maps are searched in the background and shown as they are found, edits are searched again at the end
+        from potential_maps.map_search import MapSearch
+
+        self.cancel_search()
+
+        self.ui.potential_maps.set((), ())
+        self.pruned = set()
+        self.ready = False
+        self.pending = None
+        self.maps_changed()
+
+        search = MapSearch(self.ui.image, cached, self.ui)
+        self.search_thread = search
+
+        # signals of a replaced or canceled search are ignored
+        search.progress.connect(lambda percent, text: self.on_search_progress(search, percent, text))
+        search.found.connect(lambda starts, ends, scores: self.on_maps_found(search, starts, ends, scores))
+        search.finished.connect(lambda: self.on_search_finished(search))
+
+        self.ui.set_load_progress(0, "Searching potential maps")
+        search.start()
+
+    def cancel_search(self, wait=False):
+        search = self.search_thread
+        if search is None:
+            return
+
+        self.search_thread = None
+        search.requestInterruption()
+        if wait:
+            search.wait()
+
+        self.ui.set_load_progress(None)
+
+    def on_search_progress(self, search, percent, text):
+        if search is self.search_thread:
+            self.ui.set_load_progress(percent, text)
+
+    def on_maps_found(self, search, starts, ends, scores):
+        if search is not self.search_thread:
+            return
+
+        starts, ends, scores = self.listed_maps(starts, ends, scores)
+
+        maps = self.ui.potential_maps
+        maps.replace(len(maps), len(maps), starts, ends, scores)
+        self.maps_changed()
+
+        self.ui.redraw.request("2d")
+
+    def on_search_finished(self, search):
+        if search is not self.search_thread:
+            return
+
+        self.search_thread = None
+        self.ui.set_load_progress(None)
+
+        if search.complete:
+            self.ready = True
+            pending, self.pending = self.pending, None
+            self.rescan(pending) # edited while the values were searched
+
+    def remove_map(self, i): # removed by the user or turned into a user map
+        maps = self.ui.potential_maps
+        self.suppressed.add((int(maps.starts[i]), int(maps.ends[i])))
+        maps.remove(i)
+        self.maps_changed()
+
+    def listed_maps(self, starts, ends, scores):
+        # found maps without the removed ones and the pruned ones, pruned maps are remembered for the rescan walk and the Maps tab
+        from potential_maps.map_scoring import PRUNE_SCORE
+
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float64)
+
+        pruned = scores <= PRUNE_SCORE
+        self.pruned.update(zip(starts[pruned].tolist(), ends[pruned].tolist()))
+
+        keep = ~pruned
+        if self.suppressed:
+            keep &= np.array([pair not in self.suppressed for pair in zip(starts.tolist(), ends.tolist())], dtype=bool)
+        return starts[keep], ends[keep], scores[keep]
+
+    def walk_maps(self):
+        # maps of a search walk over the whole image, the shown ones, the removed ones and the pruned ones, in order
+        maps = self.ui.potential_maps
+        if not self.suppressed and not self.pruned:
+            return maps.starts, maps.ends
+
+        removed = np.array(sorted(self.suppressed | self.pruned), dtype=np.int64)
+        starts = np.concatenate((maps.starts, removed[:, 0]))
+        order = np.argsort(starts, kind='stable')
+        return starts[order], np.concatenate((maps.ends, removed[:, 1]))[order]
+
+    def maps_changed(self): # show added, removed or replaced maps in the text view and the Maps tab
+        from PyQt6.QtCore import Qt
+        from PyQt6.QtGui import QColor
+        from PyQt6.QtWidgets import QListWidgetItem
+
+        self.ui.model.update_regions()
+
+        maps = self.ui.potential_maps
+        self.ui.potential_map_list.clear()
+        for i in maps.ranked():
+            item = QListWidgetItem(f"{maps.name(i)} ({maps.scores[i]:.0%})")
+            item.setData(Qt.ItemDataRole.UserRole, int(maps.ids[i]))
+            self.ui.potential_map_list.addItem(item)
+
+        for start, end in sorted(self.pruned): # greyed out behind the scored maps, they can still be looked at
+            item = QListWidgetItem(f"Pruned Map at {start * 2:06X} (0%)")
+            item.setData(Qt.ItemDataRole.UserRole + 1, (start, end))
+            item.setForeground(QColor("gray"))
+            self.ui.potential_map_list.addItem(item)
+
+    def rescan(self, changed):
+        # search again only around the changed image indexes (first, last) and splice the result into
+        # the found maps, the result is the same as searching the whole image again
+        if changed is None:
+            return
+
+        if not self.ready:
+            if self.pending is not None:
+                changed = (min(changed[0], self.pending[0]), max(changed[1], self.pending[1]))
+            self.pending = changed
+            return
+
+        image = self.ui.image
+        size = len(image)
+        low, high = changed
+
+        # the search walk visits the position behind the end of every map, removed and pruned maps included
+        starts, ends = self.walk_maps()
+
+        # start behind the last map that cannot have read a changed value
+        first = int(np.searchsorted(ends, low - AXES_SIZE, side='right'))
+        position = int(ends[first - 1]) + 1 if first else 0
+        stop = high + 1
+
+        new_starts, new_ends = [], []
+        while True:
+            values = np.ascontiguousarray(image.current[position:min(size, stop + 90)], dtype=np.uint16)
+            origins, found_starts, found_ends, walk_end = find_maps.scan_range(values, 0, stop - position)
+            new_starts.extend((found_starts + position).tolist())
+            new_ends.extend((found_ends + position).tolist())
+            position += walk_end
+
+            if position >= size - 90:
+                last = len(starts)
+                break
+
+            # both walks go the same way from a position the old walk visited too, that is any position
+            # that is not inside the axes or the values of an old map
+            last = int(np.searchsorted(starts, position + AXES_SIZE))
+            inside = [k for k in range(max(last - 2, first), last) if ends[k] >= position]
+            if not inside:
+                break
+            stop = int(ends[inside[-1]]) + 1
+
+        if new_starts == starts[first:last].tolist() and new_ends == ends[first:last].tolist():
+            return
 
-    def find_potential_maps(self):
-        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+        # removed maps the edit changed are gone from the walk, a map found there again is a new one
+        old_maps = set(zip(starts[first:last].tolist(), ends[first:last].tolist()))
+        self.suppressed -= old_maps - set(zip(new_starts, new_ends))
+        self.pruned -= old_maps # scored again below
 
-        from find_maps import find_potential_maps
+        from potential_maps.map_scoring import score_maps
 
-        self.ui.potential_maps_start, self.ui.potential_maps_end = find_potential_maps(list(self.ui.unpacked))
+        # scores are given when a map is found, later edits of its values do not change them
+        scores = score_maps(image.current, new_starts, new_ends)
+        new_starts, new_ends, scores = self.listed_maps(new_starts, new_ends, scores)
 
-        for i in range(len(self.ui.potential_maps_start)):
-            self.ui.potential_maps_names.append(f"Potential Map {i}")
\ No newline at end of file
+        # the same maps without the removed and pruned ones in the shown maps
+        maps = self.ui.potential_maps
+        first = int(np.searchsorted(maps.starts, starts[first])) if first < len(starts) else len(maps)
+        last = int(np.searchsorted(maps.starts, starts[last])) if last < len(starts) else len(maps)
+        maps.replace(first, last, new_starts, new_ends, scores)
+        self.maps_changed()
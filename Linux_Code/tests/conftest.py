@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+# the tests import the modules of Linux_Code, Windows_Code holds the same potential_maps and image_buffer
+# modules, run the tests against it with LINOLS_CODE=path/to/Windows_Code python -m pytest Linux_Code/tests
+# compiled modules are built in place first: setup.py build_ext --inplace in potential_maps and TableModel
+CODE = os.path.abspath(os.environ.get("LINOLS_CODE", os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if CODE not in sys.path:
+    sys.path.insert(0, CODE)
+
+
+class ImageBuilder:
+    # test images of 16-bit values, noise with maps the search walk finds planted in it
+    def __init__(self, seed=0):
+        self.rng = np.random.default_rng(seed)
+
+    def noise(self, size, high=400): # below the first axis value of a map, the walk finds nothing in it
+        return self.rng.integers(0, high, size).astype(np.uint16)
+
+    def planted_map(self, y_axis=10, x_axis=12, first=0):
+        # axes and values of a smooth map
+        y = first + np.arange(y_axis) * 100
+        x = np.arange(x_axis) * 50
+        values = np.add.outer(np.arange(y_axis) * 10, np.arange(x_axis)).ravel()
+        return np.concatenate((y, x, values)).astype(np.uint16)
+
+    def image(self, *parts):
+        return np.concatenate([np.asarray(part, dtype=np.uint16) for part in parts])
+
+    def random_axes(self):
+        # noise below the axis value limit with pairs of axes of random length planted in it, their maps run
+        # into each other and into the image end
+        values = self.rng.integers(0, 500, int(self.rng.integers(0, 3000)))
+        for _ in range(int(self.rng.integers(0, 20))):
+            first = int(self.rng.choice([0, 1, 499, 500, 2000]))
+            y_axis = first + np.arange(int(self.rng.integers(5, 20))) * int(self.rng.integers(0, 300))
+            x_axis = np.arange(int(self.rng.integers(5, 20))) * int(self.rng.integers(0, 300))
+            axes = np.concatenate((y_axis, x_axis))
+            position = int(self.rng.integers(0, max(len(values) - 20, 1)))
+            values[position:position + len(axes)] = axes[:len(values) - position]
+        return values.astype(np.uint16)
+
+    def file(self, directory, values, low_high=True): # the values as the bytes of a flash file
+        path = os.path.join(directory, "image.bin")
+        np.asarray(values).astype('<u2' if low_high else '>u2').tofile(path)
+        return path
+
+
+@pytest.fixture
+def images():
+    return ImageBuilder()
+
+
+class Window:
+    # main window without a screen, files are opened as if they were picked in the file dialog
+    def __init__(self, monkeypatch):
+        from PyQt6.QtWidgets import QApplication
+        from ui import LinOLS
+
+        self.monkeypatch = monkeypatch
+        self.app = QApplication.instance() or QApplication([])
+        self.ui = LinOLS()
+
+    def open(self, path): # returns when the file is loaded and its maps are searched
+        from PyQt6.QtWidgets import QFileDialog
+
+        self.monkeypatch.setattr(QFileDialog, "getOpenFileName", staticmethod(lambda *args, **kwargs: (path, "")))
+        self.ui.text_view_.open_file()
+        self.wait()
+
+    def wait(self):
+        deadline = time.monotonic() + 60
+        while self.ui.text_view_.loader is not None or self.ui.potential_maps_manager.search_thread is not None:
+            assert time.monotonic() < deadline, "loading or the map search did not finish"
+            self.app.processEvents()
+            time.sleep(0.001)
+
+
+@pytest.fixture
+def window(tmp_path, monkeypatch):
+    pytest.importorskip("PyQt6.QtWidgets")
+    pytest.importorskip("potential_maps.search_module") # compiled modules the window needs
+    pytest.importorskip("ui_components.TableModel.table_model")
+
+    # results of the map search are cached in the test directory
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+    window = Window(monkeypatch)
+    yield window
+    window.ui.text_view_.cancel_loading(True)
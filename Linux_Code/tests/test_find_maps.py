@@ -0,0 +1,76 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+find_maps = pytest.importorskip("potential_maps.search_module").find_maps # built with setup.py build_ext --inplace
+
+with open(os.path.join(os.path.dirname(__file__), "find_maps_golden.json")) as file:
+    GOLDEN = json.load(file)["cases"] # images and the maps the loop walk before the rewrite found in them
+
+
+def baseline_axis(values, origin):
+    # length of the rising axis at origin, 0 when it is shorter than 8 or longer than 17 values
+    for j in range(17):
+        if values[origin + j] >= values[origin + j + 1]:
+            return j + 1 if j >= 7 else 0
+    return 0
+
+
+def baseline_walk(values):
+    # the loop walk the search replaced, kept as the reference the search must match
+    values = [int(v) for v in values]
+    starts, ends = [], []
+    i = 0
+    while i < len(values) - 90:
+        y_axis = baseline_axis(values, i)
+        x_axis = baseline_axis(values, i + y_axis) if y_axis else 0
+
+        if x_axis and not (values[i] != 0 and values[i] < 500):
+            whole_size = x_axis + y_axis + x_axis * y_axis
+            starts.append(i + x_axis + y_axis)
+            ends.append(i + whole_size - 1)
+            i += whole_size
+        else:
+            i += 1
+
+    return starts, ends
+
+
+def chunked(values, chunk_size, map_chunks=map):
+    starts, ends = [], []
+    for chunk_starts, chunk_ends, searched in find_maps.search_chunks(values, map_chunks, chunk_size):
+        starts.extend(chunk_starts)
+        ends.extend(chunk_ends)
+    return starts, ends
+
+
+@pytest.mark.parametrize("case", GOLDEN, ids=[case["name"] for case in GOLDEN])
+def test_golden_maps(case):
+    values = np.array(case["values"], dtype=np.uint16)
+    expected = case["starts"], case["ends"]
+
+    assert find_maps.find_potential_maps(values) == expected
+    origins, starts, ends, position = find_maps.scan_range(values, 0, len(values))
+    assert (starts.tolist(), ends.tolist()) == expected
+    for chunk_size in (1, 91, 97, 256, 1000):
+        assert chunked(values, chunk_size) == expected
+
+
+def test_golden_corpus_matches_the_baseline_walk():
+    for case in GOLDEN:
+        assert baseline_walk(case["values"]) == (case["starts"], case["ends"]), case["name"]
+
+
+def test_random_images_match_the_baseline_walk(images):
+    with ThreadPoolExecutor(4) as executor:
+        for _ in range(300):
+            values = images.random_axes()
+            expected = baseline_walk(values)
+
+            assert find_maps.find_potential_maps(values) == expected
+            chunk_size = int(images.rng.integers(1, 700))
+            assert chunked(values, chunk_size) == expected
+            assert find_maps.find_potential_maps_parallel(values, executor, chunk_size) == expected
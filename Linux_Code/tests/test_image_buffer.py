@@ -0,0 +1,43 @@
+import os
+
+from image_buffer.image_buffer import ImageBuffer
+
+
+def opened(images, tmp_path):
+    image = ImageBuffer()
+    image.open(images.file(str(tmp_path), images.noise(4096, 65535)), True)
+    return image
+
+
+def test_saving_again_replaces_the_file(images, tmp_path):
+    image = opened(images, tmp_path)
+    target = str(tmp_path / "saved.bin")
+
+    image.write(10, 7)
+    image.save(target)
+    first = os.stat(target).st_ino
+
+    image.write(1000, 1)
+    image.save(target) # a new file renamed over the saved one, never a half written one
+    assert os.stat(target).st_ino != first
+    assert open(target, 'rb').read() == image.current_bytes.tobytes()
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_in_place_save_patches_the_saved_file(images, tmp_path):
+    image = opened(images, tmp_path)
+    target = str(tmp_path / "saved.bin")
+    image.save(target)
+    first = os.stat(target).st_ino
+
+    image.write(slice(2500, 2503), 2)
+    image.save(target, in_place=True)
+    assert os.stat(target).st_ino == first
+    assert open(target, 'rb').read() == image.current_bytes.tobytes()
+
+    with open(target, 'r+b') as file: # changed by another program, written in full again
+        file.write(b"\0\0")
+    image.write(3, 9)
+    image.save(target, in_place=True)
+    assert os.stat(target).st_ino != first
+    assert open(target, 'rb').read() == image.current_bytes.tobytes()
@@ -0,0 +1,25 @@
+def test_failed_load_shows_the_error(window, tmp_path, monkeypatch):
+    from PyQt6.QtWidgets import QMessageBox
+
+    warnings = []
+    monkeypatch.setattr(QMessageBox, "warning", staticmethod(lambda parent, title, text: warnings.append(text)))
+    progress = []
+    monkeypatch.setattr(window.ui, "set_load_progress", lambda percent, text="": progress.append(percent))
+
+    path = tmp_path / "odd.bin"
+    path.write_bytes(bytes(3))
+    window.open(str(path))
+
+    assert warnings == ["Please open a valid file!\nInvalid file size: 3 bytes"]
+    assert progress[0] == -1 # mapping the file has no length to show
+
+
+def test_cache_lookup_shows_a_busy_progress(window, images, tmp_path, monkeypatch):
+    progress = []
+    monkeypatch.setattr(window.ui, "set_load_progress", lambda percent, text="": progress.append((percent, text)))
+
+    window.open(images.file(str(tmp_path), images.image(images.noise(2000), images.planted_map())))
+
+    looking = progress.index((-1, "Looking for searched maps")) # hashing the file for the cache key
+    assert (0, "Searching potential maps") in progress[looking:] # not cached, searched with a known length
+    assert len(window.ui.potential_maps) == 1
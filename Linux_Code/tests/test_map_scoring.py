@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+find_maps = pytest.importorskip("potential_maps.search_module").find_maps # built with setup.py build_ext --inplace
+
+from potential_maps.map_scoring import score_maps
+
+
+def test_map_ending_at_the_last_value_is_scored(images):
+    values = images.image(images.noise(300), images.planted_map())
+
+    starts, ends = find_maps.find_potential_maps(values)
+    assert ends[-1] == len(values) - 1
+
+    scores = score_maps(values, starts, ends)
+    assert scores[-1] > 0.9
+
+
+def test_map_running_past_the_image_is_not_read(images):
+    values = images.image(images.noise(300), images.planted_map()[:100]) # the walk still reports the whole map
+
+    starts, ends = find_maps.find_potential_maps(values)
+    assert ends[-1] >= len(values)
+
+    features = find_maps.map_features(values, starts, ends)
+    assert not features[-1].any()
+    assert score_maps(values, starts, ends)[-1] == 0
+
+
+def test_maps_at_the_end_of_random_images(images):
+    for _ in range(200):
+        size = int(images.rng.integers(95, 400))
+        values = images.noise(size, 65535)
+        position = int(images.rng.integers(0, size - 91))
+        values[position:position + 22] = images.planted_map()[:22] # axes, the map values are cut off by the image end
+
+        starts, ends = find_maps.find_potential_maps(values)
+        features = find_maps.map_features(values, starts, ends)
+        outside = np.asarray(ends, dtype=np.int64) >= size
+        assert not features[outside].any()
+        assert (features[~outside, 8] <= 65535).all()
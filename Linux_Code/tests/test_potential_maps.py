@@ -0,0 +1,59 @@
+import pytest
+
+find_maps = pytest.importorskip("potential_maps.search_module").find_maps # built with setup.py build_ext --inplace
+
+
+def assert_full_search(ui):
+    # shown maps are the maps of a search over the whole image, without the pruned ones
+    from potential_maps.map_scoring import score_maps
+
+    values = ui.image.current
+    starts, ends = find_maps.find_potential_maps(values)
+    scores = score_maps(values, starts, ends)
+    expected = [(start, end) for start, end, score in zip(starts, ends, scores) if score > 0]
+
+    maps = ui.potential_maps
+    assert list(zip(maps.starts.tolist(), maps.ends.tolist())) == expected
+
+
+def test_edit_after_a_byte_order_switch_matches_a_full_search(window, images, tmp_path):
+    ui = window.ui
+    parts = [images.noise(2000, 65535)]
+    for _ in range(40):
+        parts += [images.planted_map(int(images.rng.integers(8, 18)), int(images.rng.integers(8, 18))),
+                  images.noise(int(images.rng.integers(0, 300)), 65535)]
+    window.open(images.file(str(tmp_path), images.image(*parts)))
+    assert_full_search(ui)
+    low_high_maps = len(ui.potential_maps)
+
+    ui.text_view_.change_display_mode("high_low")
+    window.wait()
+    assert_full_search(ui)
+    assert len(ui.potential_maps) != low_high_maps
+
+    for position in images.rng.integers(0, len(ui.image) - 30, 20):
+        ui.model.write(slice(int(position), int(position) + 22), images.planted_map()[:22])
+        assert_full_search(ui)
+
+    ui.text_view_.change_display_mode("low_high")
+    window.wait()
+    ui.model.write(100, 0)
+    assert_full_search(ui)
+
+
+def test_pruned_maps_are_listed_last_and_can_be_shown(window, images, tmp_path):
+    ui = window.ui
+    values = images.image(images.noise(3000), images.planted_map(), images.noise(500), images.planted_map()[:120])
+    window.open(images.file(str(tmp_path), values)) # the last map runs past the image
+    assert_full_search(ui)
+
+    start, end = sorted(ui.potential_maps_manager.pruned)[0]
+    assert end >= len(values) and len(ui.potential_maps) == 1
+
+    items = ui.potential_map_list
+    assert items.count() == 2 and items.item(1).text().startswith("Pruned Map")
+
+    ui.maps.show_potential_map(items.item(1))
+    selection_starts, selection_stops = ui.text_addons.selection_intervals()
+    assert int(selection_starts[0]) - ui.shift_count == start
+    assert int(selection_stops[-1]) - ui.shift_count == len(values)
@@ -1,61 +1,31 @@
 from PyQt6.QtWidgets import QMessageBox, QApplication, QTableView, QFileDialog
-import time
-import struct
+import numpy as np
 
 class TextAddons:
     def __init__(self, ui):
         self.ui = ui
-        self.time_col = 0
-        self.time_shift = 0
-        self.delay_limit = 0.3
 
     def revert_value(self, row, col):
-        new = self.ui.unpacked[(row * self.ui.columns) + col]
+        new = int(self.ui.image.original[(row * self.ui.columns) + col - self.ui.shift_count])
         QMessageBox.warning(self.ui, "Invalid Number!", "You have entered an invalid number!")
         return new
 
-    def highlight_difference(self, new_value, row, col):
-        index = (row * self.ui.columns) + col
-        if len(self.ui.unpacked) - 1 <= index:
-            return "default"
-        ori_value = self.ui.unpacked[index - self.ui.shift_count]
-        if new_value is None:
-            return None
-        if new_value > ori_value:
-            return "red"
-        elif new_value < ori_value:
-            return "blue"
-        else:
-            return "default"
-
     def on_selection(self):
         self.update_selected_count()
         self.update_ori_label()
 
     def update_selected_count(self):
-        selection_model = self.ui.table_view.selectionModel()
-        selected_indexes_count = len(selection_model.selectedIndexes())
-
-        if selected_indexes_count > 2500:
-            selection_model.clearSelection()
-            selected_indexes_count = len(selection_model.selectedIndexes())
-
-        self.ui.sel_label.setText(f"Selected: {selected_indexes_count}")
+        self.ui.sel_label.setText(f"Selected: {self.selected_count()}")
 
     def update_ori_label(self):
-        selection_model = self.ui.table_view.selectionModel()
-        selected_indexes = selection_model.selectedIndexes()
-
-        if len(selected_indexes) == 1:
-            selected_index = selected_indexes[0]
-            if not selected_index.data():
+        if self.selected_count() == 1:
+            row, col = self.first_selected()
+            current_item = self.ui.model.get_value(row, col)
+            if current_item is None:
                 return
-            current_item = int(selected_index.data())
-            row = selected_index.row()
-            col = selected_index.column()
-            index = (row * self.ui.columns) + col
-            if index <= len(self.ui.unpacked):
-                ori_value = self.ui.unpacked[index - self.ui.shift_count]
+            index = (row * self.ui.columns) + col - self.ui.shift_count
+            if 0 <= index < len(self.ui.image):
+                ori_value = int(self.ui.image.original[index])
                 self.ui.value_label.setText(f"Ori: {ori_value:05}")
                 if current_item != 0 and ori_value != 0:
                     percentage_change = min(((current_item / ori_value) - 1) * 100, 999.99)
@@ -73,12 +43,7 @@ class TextAddons:
             self.ui.difference_label.setText(f"0 (0.00%)")
 
     def copy_hex_address(self):
-        selection_model = self.ui.table_view.selectionModel()
-        selected_indexes = selection_model.selectedIndexes()
-
-        selected_index = selected_indexes[0]
-        row = selected_index.row()
-        col = selected_index.column()
+        row, col = self.first_selected()
 
         index = (row * self.ui.columns + col) * 2
 
@@ -100,212 +65,132 @@ class TextAddons:
                 QMessageBox.warning(self.ui, "Warning", "Data selection is not correct!")
                 return False
 
-        selection_model = self.ui.table_view.selectionModel()
-        selected_indexes = selection_model.selectedIndexes()
+        from clipboard_codec.clipboard_codec import encode
 
-        last_row = -1 # for storing previous row
+        display_indexes = self.selected_display_indexes()
+        indexes = display_indexes - self.ui.shift_count
+        inside = (indexes >= 0) & (indexes < len(self.ui.image))
+
+        values = np.full(len(indexes), "", dtype=object) # cells in front of or behind the image stay empty
+        values[inside] = list(map(str, self.ui.image.current[indexes[inside]].tolist()))
 
         clipboard = QApplication.clipboard()
         clipboard.clear()
-
-        text_values = ""
-
-        for item in selected_indexes:
-            row = item.row() # current row
-            col = item.column() # current column
-
-            index = (row * self.ui.columns) + col
-            value = str(self.ui.current_values[index])
-
-            if last_row == -1:
-                text_values += value
-            elif row == last_row:
-                text_values += '\t' + value
-            else:
-                text_values += '\n' + value
-
-            last_row = row
-
-        clipboard.setText(text_values)
+        clipboard.setText(encode(values, display_indexes // self.ui.columns))
 
         if maps:
             return True
 
-    def check_selection_rectangle(self):
-        selection_model = self.ui.table_view.selectionModel()  # get all selected items
-        selected_indexes = selection_model.selectedIndexes()  # all selected items
+    def selection_ranges(self):
+        # (top, left, bottom, right) of every selected rectangle, cells are never listed one by one
+        ranges = [(selection_range.top(), selection_range.left(), selection_range.bottom(), selection_range.right())
+                  for selection_range in self.ui.table_view.selectionModel().selection()]
 
-        if len(selected_indexes) < 1 or len(selected_indexes) > 1200:
-            return False
+        return np.array(ranges, dtype=np.int64).reshape(-1, 4)
 
-        last_row = selected_indexes[0].row()
-        start_col = selected_indexes[0].column()
+    def selection_intervals(self):
+        # selected cells as sorted, non-overlapping [start, stop) runs of display indexes
+        ranges = self.selection_ranges()
+        columns = self.ui.columns
 
-        for i in range(1, len(selected_indexes)):
-            row = selected_indexes[i].row()
-            col = selected_indexes[i].column()
+        full_rows = (ranges[:, 1] == 0) & (ranges[:, 3] == columns - 1) # one run for the whole range
+        starts = [ranges[full_rows, 0] * columns]
+        stops = [(ranges[full_rows, 2] + 1) * columns]
+        for top, left, bottom, right in ranges[~full_rows]: # one run per row
+            rows = np.arange(top, bottom + 1, dtype=np.int64) * columns
+            starts.append(rows + left)
+            stops.append(rows + right + 1)
 
-            if last_row != row and not last_row + 1 == row:
-                return False
-
-            if last_row != row and start_col != col:
-                return False
+        starts = np.concatenate(starts)
+        stops = np.concatenate(stops)
+        if not len(starts):
+            return starts, stops
 
+        order = np.argsort(starts, kind='stable')
+        starts, stops = starts[order], stops[order]
 
-            last_row = row
+        # runs overlapping or touching the runs before them are joined
+        first = np.flatnonzero(np.r_[True, starts[1:] > np.maximum.accumulate(stops)[:-1]])
 
-        return True
+        return starts[first], np.maximum.reduceat(stops, first)
 
-    def check_selection_consecutive(self):
-        selection_model = self.ui.table_view.selectionModel()  # get all selected items
-        selected_indexes = selection_model.selectedIndexes()  # all selected items
+    def selected_count(self):
+        starts, stops = self.selection_intervals()
+        return int((stops - starts).sum())
 
-        if len(selected_indexes) < 1 or len(selected_indexes) > 1200:
-            return False
+    def first_selected(self): # row and column of the first selected cell, or None
+        ranges = self.selection_ranges()
+        if not len(ranges):
+            return None
 
-        last_row = selected_indexes[0].row()
-        start_col = selected_indexes[0].column()
+        return divmod(int((ranges[:, 0] * self.ui.columns + ranges[:, 1]).min()), self.ui.columns)
 
-        for i in range(1, len(selected_indexes)):
-            row = selected_indexes[i].row()
-            col = selected_indexes[i].column()
+    def selected_display_indexes(self):
+        from image_buffer.image_patch import run_indexes
 
-            if last_row != row and not last_row + 1 == row:
-                return False
+        starts, stops = self.selection_intervals()
+        return run_indexes(starts, stops - starts)
 
-            if start_col + 1 == self.ui.columns:
-                start_col = 0
-            else:
-                start_col += 1
+    def select_interval(self, start, end):
+        # select display indexes start to end as at most three rectangles instead of cell by cell
+        from PyQt6.QtCore import QItemSelection, QItemSelectionModel
 
-            if col != start_col:
-                return False
+        columns = self.ui.columns
+        first_row, first_col = divmod(start, columns)
+        last_row, last_col = divmod(end, columns)
 
-            last_row = row
+        if first_row == last_row:
+            rectangles = [(first_row, first_col, last_row, last_col)]
+        else:
+            rectangles = [(first_row, first_col, first_row, columns - 1), (last_row, 0, last_row, last_col)]
+            if last_row - first_row > 1:
+                rectangles.append((first_row + 1, 0, last_row - 1, columns - 1))
 
-        return True
+        selection = QItemSelection()
+        for top, left, bottom, right in rectangles:
+            selection.select(self.ui.model.index(top, left), self.ui.model.index(bottom, right))
 
-    def check_valid_data(self, clipboard_text ,values, col_ori, row_start, col_start):
-        try:
-            entered_new_line = False
-            x = 0
-            for i in range(len(clipboard_text)): # insert data
-                if values[row_start][col_start] is None:
-                    raise IndexError
-                if clipboard_text[i] == '\t':
-                    x += 1
-                    if col_start + 1 >= self.ui.columns:
-                        row_start += 1
-                        col_start = 0
-                        entered_new_line = True
-                    else:
-                        col_start += 1
+        self.ui.table_view.selectionModel().select(selection, QItemSelectionModel.SelectionFlag.Select)
 
-                if clipboard_text[i] == '\n':
-                    x += 1
-                    if not entered_new_line:
-                        row_start += 1
-                    else:
-                        entered_new_line = False
+    def check_selection_rectangle(self):
+        ranges = self.selection_ranges()
+        if not len(ranges):
+            return False
 
-                    col_start = col_ori
+        top, left = ranges[:, :2].min(axis=0)
+        bottom, right = ranges[:, 2:].max(axis=0)
 
-        except IndexError:
-            QMessageBox.warning(self.ui, "Warning", "Data cannot be pasted!")
-            return False
+        return self.selected_count() == (bottom - top + 1) * (right - left + 1)
 
-        return True
+    def check_selection_consecutive(self):
+        starts, stops = self.selection_intervals()
+        return len(starts) == 1
 
     def paste_values(self):
         if not self.ui.file_path:
             QMessageBox.warning(self.ui, "Warning", "No file is currently open. Please open a file first.")
             return
 
-        selection_model = self.ui.table_view.selectionModel() # get all selected items
-        selected_indexes = selection_model.selectedIndexes() # all selected items
-
-        first_item = selected_indexes[0] # first selected item
-        row_ori = first_item.row() # current row
-        col_ori = first_item.column() # current column
-
-        clipboard = QApplication.clipboard()
-        clipboard_text = clipboard.text() # get text from clipboard
-
-        if clipboard_text[-1] == '\n':
-            clipboard_text = clipboard_text[:-1]
-
-        values_clipboard = clipboard_text.strip().split()
-
-        if len(values_clipboard) > 800:
-            QMessageBox.warning(self.ui, "Warning", "Too much data!")
+        if self.first_selected() is None:
             return
+        row_ori, col_ori = self.first_selected()
 
-        for i in range(len(values_clipboard)):
-            try:
-                int(values_clipboard[i])
-            except ValueError:
-                QMessageBox.warning(self.ui, "Warning", "Data is not correct!")
-                return
-
-        x = 0 # clipboard values counter
-
-        values = self.ui.model.get_all_data()
-
-        row_start = row_ori
-        col_start = col_ori
-
-        if not self.check_valid_data(clipboard_text ,values, col_ori, row_start, col_start):
-            return
+        from clipboard_codec.clipboard_codec import decode
 
         try:
-            values_clipboard = clipboard_text.strip().replace('\r\n', '\n').replace('\t', '\n').split('\n')
-
-            x = row_start
-            y = col_start
-
-            for i in range(len(values_clipboard)): # insert data
-                if y == self.ui.columns:
-                    x += 1
-                    y = 0
-                values[x][y] = int(values_clipboard[i])
+            values = decode(QApplication.clipboard().text())[0] # rows are pasted one after another
+        except ValueError:
+            QMessageBox.warning(self.ui, "Warning", "Data is not correct!")
+            return
 
-                y += 1
+        index = (row_ori * self.ui.columns) + col_ori - self.ui.shift_count
 
-        except IndexError:
+        if index < 0 or index + len(values) > len(self.ui.image):
             QMessageBox.warning(self.ui, "Warning", "Data cannot be pasted!")
             return
 
-        # reinsert data
-        self.ui.current_values = []
-
-        for i in range(self.ui.shift_count):
-            self.ui.current_values.append(None)
-
-        for row in values:
-            for col in row:
-                if col is not None:
-                    self.ui.current_values.append(col)
-
-        rows = [self.ui.current_values[i:i + self.ui.columns] for i in
-                range(0, len(self.ui.current_values) - self.ui.columns, self.ui.columns)]  # get values by rows
-
-        remaining_elements = len(self.ui.current_values) % self.ui.columns  # last row offset
+        self.ui.model.write(slice(index, index + len(values)), values)
 
-        if remaining_elements:
-            last_row = list(self.ui.current_values[-remaining_elements:]) + [None] * (
-                    self.ui.columns - remaining_elements)  # last row values
-            rows.append(last_row)
-
-        self.ui.model.set_data(rows)
-        self.ui.model.layoutChanged.emit()
-
-        from text_view import TextView
-        text_view = TextView(self.ui)
-
-        text_view.set_labels_y_axis()
-        text_view.set_column_width()
-        
-        
         if not self.ui.tab1_selected:
             index_sel = self.ui.model.index(row_ori, col_ori)
             self.ui.table_view.scrollTo(index_sel, QTableView.ScrollHint.PositionAtCenter)
@@ -315,18 +200,10 @@ class TextAddons:
             QMessageBox.warning(self.ui, "Warning", "No file is currently open. Please open a file first.")
             return
 
-        current_time = time.time()
-        if self.time_col + self.delay_limit >= current_time:
-            return
-
-        self.time_col = current_time
-
-        selection_model = self.ui.table_view.selectionModel()
-        selected_indexes = selection_model.selectedIndexes()
+        first_selected = self.first_selected()
 
-        if selected_indexes:
-            current_row = selected_indexes[0].row()
-            current_col = selected_indexes[0].column()
+        if first_selected is not None:
+            current_row, current_col = first_selected
             index = (current_row * self.ui.columns) + current_col
         else:
             index = self.ui.table_view.get_first_visible_index()
@@ -342,24 +219,12 @@ class TextAddons:
             self.ui.shift_count -= 1
             self.ui.entry_shift.setText(f"Shift: {self.ui.shift_count:02}")
 
-        values = self.ui.model.get_all_data()
-
-        from column_transform.column_transform_module import gather_values
-
-        self.ui.current_values, rows = gather_values(self.ui.shift_count, self.ui.columns, values)
-
-        self.ui.model.set_data(rows)
-        self.ui.model.layoutChanged.emit()
-
-        text_view = self.ui.text_view_
-        text_view.set_labels_y_axis()
-        text_view.set_column_width()
+        self.ui.text_view_.refresh_table()
 
         self.ui.entry_col.setText(f"Columns: {self.ui.columns:02}")
 
-        if self.ui.current_values[index] is None:
-            while index < len(self.ui.current_values) and self.ui.current_values[index] is None:
-                index += 1
+        if index < self.ui.shift_count: # skip empty cells in front of the shifted values
+            index = self.ui.shift_count
 
         self.ui.mode2d.highlight_text(index - self.ui.shift_count, True)
 
@@ -368,57 +233,27 @@ class TextAddons:
             QMessageBox.warning(self.ui, "Warning", "No file is currently open. Please open a file first.")
             return
 
-        time_shift_now = time.time()
-
-        if self.time_shift + self.delay_limit >= time_shift_now:
-            return
-
-        self.time_shift = time_shift_now
+        first_selected = self.first_selected()
 
-        selection_model = self.ui.table_view.selectionModel()
-        selected_indexes = selection_model.selectedIndexes()
-
-        if selected_indexes:
-            current_row = selected_indexes[0].row()
-            current_col = selected_indexes[0].column()
+        if first_selected is not None:
+            current_row, current_col = first_selected
             index = (current_row * self.ui.columns) + current_col
         else:
             index = self.ui.table_view.get_first_visible_index()
 
         if mode == "+" and self.ui.shift_count + 1 < self.ui.columns:
-            self.ui.shift_count += 1
-            for i in range(len(self.ui.potential_maps_start)):
-                self.ui.potential_maps_start[i] += 1
-                self.ui.potential_maps_end[i] += 1
+            self.ui.shift_count += 1 # potential maps are kept in image positions and do not move
         elif mode == "-" and self.ui.shift_count >= 1:
             self.ui.shift_count -= 1
-            for i in range(len(self.ui.potential_maps_start)):
-                self.ui.potential_maps_start[i] -= 1
-                self.ui.potential_maps_end[i] -= 1
         else:
             return
 
-        values = self.ui.model.get_all_data()
-
-        from column_transform.column_transform_module import gather_values
-
-        self.ui.current_values, rows = gather_values(self.ui.shift_count, self.ui.columns, values)
-
-        self.ui.model.set_data(rows)
-        self.ui.model.layoutChanged.emit()
-
-        from text_view import TextView
-        text_view = TextView(self.ui)
-
-        text_view.set_labels_y_axis()
-        text_view.set_column_width()
+        self.ui.text_view_.refresh_table()
 
         self.ui.entry_shift.setText(f"Shift: {self.ui.shift_count:02}")
 
-        if self.ui.current_values[index] is None:
-            while index < len(self.ui.current_values) and self.ui.current_values[index] is None:
-                index += 1
-            index -= 1
+        if index < self.ui.shift_count: # skip empty cells in front of the shifted values
+            index = self.ui.shift_count - 1
 
         self.ui.mode2d.highlight_text(index - self.ui.shift_count + (1 if mode == "+" else -1), True)
 
@@ -430,16 +265,13 @@ class TextAddons:
         if index == 1:
             self.ui.disable_2d_canvas = False
             self.ui.sync_2d_scroll = False
-            selection_model = self.ui.table_view.selectionModel()
-            selected_indexes = selection_model.selectedIndexes()
-            if selected_indexes:
-                item = selected_indexes[0]
-                row = item.row()
-                col = item.column()
+            first_selected = self.first_selected()
+            if first_selected is not None:
+                row, col = first_selected
                 index = (row * self.ui.columns) + col - self.ui.shift_count
                 self.ui.red_line = index - self.ui.current_frame
                 self.ui.mode2d.highlight_text(index, True)
-            self.ui.mode2d.draw_canvas(self.ui)
+            self.ui.redraw.request("2d")
 
         else:
             self.ui.disable_2d_canvas = True
@@ -460,171 +292,42 @@ class TextAddons:
                                                  "Please open a file for importing first.")
             return
 
-        with open(import_file_path, 'rb') as file:
-            content = file.read()
-            if self.ui.low_high:
-                values = struct.unpack('<' + 'H' * (len(content) // 2), content)
-            else:
-                values = struct.unpack('>' + 'H' * (len(content) // 2), content)
-
-        self.ui.current_values = []
-
-        for i in range(self.ui.shift_count):
-            self.ui.current_values.append(None)
-
-        for item in values:
-            if item is not None:
-                self.ui.current_values.append(item)
-
-        rows = [self.ui.current_values[i:i + self.ui.columns] for i in
-                range(0, len(self.ui.current_values) - self.ui.columns, self.ui.columns)]  # get values by rows
-
-        remaining_elements = len(self.ui.current_values) % self.ui.columns  # last row offset
-
-        if remaining_elements:
-            last_row = list(self.ui.current_values[-remaining_elements:]) + [None] * (
-                    self.ui.columns - remaining_elements)  # last row values
-            rows.append(last_row)
-
-        self.ui.model.set_data(rows)
-        self.ui.model.layoutChanged.emit()
-
-        from text_view import TextView
-        text_view = TextView(self.ui)
-
-        text_view.set_labels_y_axis()
-        text_view.set_column_width()
-
-    def set_text(self, int_value):
-        selection_model = self.ui.table_view.selectionModel()
-        selected_indexes = selection_model.selectedIndexes()
-        if not selected_indexes:
-            QMessageBox.warning(self.ui, "Warning", "There is no values selected!")
-            return
-
-        temp_list = list(self.ui.current_values)
-
-        for item in selected_indexes:
-            row = item.row()
-            col = item.column()
-
-            index = (row * self.ui.columns) + col
-
-            temp_list[index] = int(int_value)
-
-        self.ui.current_values = temp_list
-
-        rows = [self.ui.current_values[i:i + self.ui.columns] for i in
-                range(0, len(self.ui.current_values) - self.ui.columns, self.ui.columns)]  # get values by rows
-
-        remaining_elements = len(self.ui.current_values) % self.ui.columns  # last row offset
-
-        if remaining_elements:
-            last_row = list(self.ui.current_values[-remaining_elements:]) + [None] * (
-                    self.ui.columns - remaining_elements)  # last row values
-            rows.append(last_row)
-
-        self.ui.model.set_data(rows)
-        self.ui.model.layoutChanged.emit()
-
-        self.ui.text_view_.set_labels_y_axis()
-        self.ui.text_view_.set_column_width()
-
-    def increase_selected_text(self, int_value):
         try:
-            selection_model = self.ui.table_view.selectionModel()
-            selected_indexes = selection_model.selectedIndexes()
-            if not selected_indexes:
-                QMessageBox.warning(self.ui, "Warning", "There is no values selected!")
-                return
-
-            temp_list = list(self.ui.current_values)
-
-            for item in selected_indexes:
-                row = item.row()
-                col = item.column()
-
-                index_elements = (row * self.ui.columns) + col
-
-                new_value = int_value + self.ui.current_values[index_elements]
-
-                if 0 > new_value or new_value > 65535:
-                    raise ValueError
-
-                index = (row * self.ui.columns) + col
-
-                temp_list[index] = int(new_value)
+            changed = self.ui.image.import_values(import_file_path)
+        except (OSError, ValueError):
+            QMessageBox.warning(self.ui, "Warning", "The imported file does not match the opened file!")
+            return
 
-            self.ui.current_values = temp_list
+        self.ui.model.refresh_range(changed)
 
-            rows = [self.ui.current_values[i:i + self.ui.columns] for i in
-                    range(0, len(self.ui.current_values) - self.ui.columns, self.ui.columns)]  # get values by rows
+    def selected_image_indexes(self):
+        from image_buffer.image_patch import run_indexes
 
-            remaining_elements = len(self.ui.current_values) % self.ui.columns  # last row offset
+        starts, stops = self.selection_intervals()
 
-            if remaining_elements:
-                last_row = list(self.ui.current_values[-remaining_elements:]) + [None] * (
-                        self.ui.columns - remaining_elements)  # last row values
-                rows.append(last_row)
+        # positions in the image, cells in front of or behind the image are dropped
+        starts = np.clip(starts - self.ui.shift_count, 0, len(self.ui.image))
+        stops = np.clip(stops - self.ui.shift_count, 0, len(self.ui.image))
 
-            self.ui.model.set_data(rows)
-            self.ui.model.layoutChanged.emit()
+        return run_indexes(starts, stops - starts)
 
-            self.ui.text_view_.set_labels_y_axis()
-            self.ui.text_view_.set_column_width()
+    def apply_operation(self, operation, operands, policy="Reject"):
+        from value_operations.value_operations import evaluate
 
-        except ValueError:
-            QMessageBox.warning(self.ui, "Warning", "Please enter a valid number.")
+        indexes = self.selected_image_indexes()
+        if not len(indexes):
+            QMessageBox.warning(self.ui, "Warning", "There is no values selected!")
+            return False
 
-    def increase_selected_text_per(self, float_value):
         try:
-            percentage_increase = float_value / 100.0
-
-            selection_model = self.ui.table_view.selectionModel()
-            selected_indexes = selection_model.selectedIndexes()
-            if not selected_indexes:
-                QMessageBox.warning(self.ui, "Warning", "There is no values selected!")
-                return
-
-            temp_list = list(self.ui.current_values)
-
-            for item in selected_indexes:
-                row = item.row()
-                col = item.column()
-
-                index = (row * self.ui.columns) + col
-
-                current_value = self.ui.current_values[index]
-                increase_value = int(current_value * percentage_increase)
-
-                new_value = current_value + increase_value
-
-                if 0 > new_value or new_value > 65535:
-                    raise ValueError
-
-
-                temp_list[index] = new_value
-
-            self.ui.current_values = temp_list
-
-            rows = [self.ui.current_values[i:i + self.ui.columns] for i in
-                    range(0, len(self.ui.current_values) - self.ui.columns, self.ui.columns)]  # get values by rows
-
-            remaining_elements = len(self.ui.current_values) % self.ui.columns  # last row offset
-
-            if remaining_elements:
-                last_row = list(self.ui.current_values[-remaining_elements:]) + [None] * (
-                        self.ui.columns - remaining_elements)  # last row values
-                rows.append(last_row)
-
-            self.ui.model.set_data(rows)
-            self.ui.model.layoutChanged.emit()
+            new_values = evaluate(self.ui.image.current[indexes], operation, operands, policy)
+        except ValueError as e:
+            QMessageBox.warning(self.ui, "Warning", str(e))
+            return False
 
-            self.ui.text_view_.set_labels_y_axis()
-            self.ui.text_view_.set_column_width()
+        self.ui.model.write(indexes, new_values.astype(np.int64))
 
-        except ValueError:
-            QMessageBox.warning(self.ui, "Warning", "Please enter a valid number.")
+        return True
 
     def open_find_dialog(self):
         if not self.ui.file_path:
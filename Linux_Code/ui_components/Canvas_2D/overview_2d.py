@@ -0,0 +1,84 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.collections import PolyCollection
+from matplotlib.patches import Rectangle
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+
+VALUE_RANGE = 65535 # height of the plot
+MIN_VIEW = 200 # values shown at the closest zoom
+
+
+class Overview2D:
+    # lowest and highest values of the whole image, the wheel zooms around the pointer and a click moves
+    # the 2D frame and the text view there
+    def __init__(self, ui):
+        self.ui = ui
+        self.view = None # first and last + 1 image position shown, None shows the whole image
+
+        self.fig = Figure(figsize=(8, 1), dpi=100)
+        self.fig.patch.set_facecolor('#333')
+        self.fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
+
+        self.ax = self.fig.add_subplot()
+        self.ax.set_facecolor('#333')
+        self.ax.axis('off')
+        self.ax.set_ylim(0, VALUE_RANGE)
+
+        self.envelope = PolyCollection([], facecolor="white", edgecolor="white", linewidth=0.5)
+        self.ax.add_collection(self.envelope)
+        self.frame = Rectangle((0, 0), 0, VALUE_RANGE, color="#bd090e", alpha=0.4) # values shown in the 2D plot
+        self.ax.add_patch(self.frame)
+
+        self.canvas = FigureCanvas(self.fig)
+        self.canvas.setStyleSheet("border: 0;")
+        self.canvas.setFixedHeight(80)
+
+        self.canvas.mpl_connect("scroll_event", self.on_scroll)
+        self.canvas.mpl_connect("button_press_event", self.on_click)
+
+    def show(self):
+        size = len(self.ui.image)
+        if not size:
+            return
+
+        if self.view is None or self.view[1] > size:
+            self.view = (0, size)
+        low, high = self.view
+
+        positions, minimum, maximum = self.ui.image.overview().envelope(low, high, self.canvas.width())
+        self.envelope.set_verts([np.column_stack((np.r_[positions, positions[::-1]], np.r_[maximum, minimum[::-1]]))])
+
+        self.frame.set_x(self.ui.current_frame)
+        self.frame.set_width(max(self.ui.mode2d.view_size(), (high - low) // 200)) # seen at any zoom
+
+        self.ax.set_xlim(low, high)
+        self.canvas.draw_idle()
+
+    def on_scroll(self, event):
+        size = len(self.ui.image)
+        if event.xdata is None or not size:
+            return
+
+        # nothing shown yet or the view of a larger file, zoom from the whole image like show does
+        low, high = self.view if self.view is not None and self.view[1] <= size else (0, size)
+        factor = 0.5 if event.button == "up" else 2
+        width = min(max(int((high - low) * factor), MIN_VIEW), size)
+
+        # the value under the pointer stays in place
+        low = int(event.xdata - (event.xdata - low) * width / (high - low))
+        low = min(max(low, 0), size - width)
+        self.view = (low, low + width)
+        self.show()
+
+    def on_click(self, event):
+        if event.button != 1 or event.xdata is None or not len(self.ui.image):
+            return
+
+        position = min(max(int(event.xdata), 0), len(self.ui.image) - 1)
+
+        self.ui.current_frame = self.ui.mode2d.frame_start(position)
+        self.ui.red_line = position - self.ui.current_frame
+        self.ui.display_sel = False
+
+        self.ui.mode2d.highlight_text(position, True)
+        self.ui.redraw.request("2d")
@@ -4,144 +4,167 @@ from PyQt6.QtCore import (
 )
 from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import QMessageBox
+import numpy as np
+
+# region of every image value, user maps are drawn over potential maps
+NO_MAP = 0
+POTENTIAL_MAP = 1
+USER_MAP = 2
 
 class CustomTableModel(QAbstractTableModel):
-    def __init__(self, data, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
         self.linols = parent
-        self._data = [list(row) for row in data]
-        self._vertical_header_labels = []
-        self.undo_stack = []
-        self.redo_stack = []
-
+        self.regions = np.zeros(0, dtype=np.uint8) # map region of every image value, see update_regions
+        self.diff_colors = {
+            1: QColor(Qt.GlobalColor.red), # increased
+            -1: QColor(Qt.GlobalColor.blue), # decreased
+            0: QColor(Qt.GlobalColor.white),
+        }
+        self.region_colors = {
+            USER_MAP: QColor(133, 215, 242, 150), # light blue
+            POTENTIAL_MAP: QColor(1, 133, 123, 150), # teal green
+        }
+
+    # cells are computed from the image buffer, columns and shift only change the arithmetic
     def rowCount(self, parent: QModelIndex = QModelIndex()):
-        return len(self._data)
+        if not len(self.linols.image):
+            return 0
+        return (len(self.linols.image) + self.linols.shift_count + self.linols.columns - 1) // self.linols.columns
 
     def columnCount(self, parent: QModelIndex = QModelIndex()):
-        return len(self._data[0]) if self._data else 0
+        return self.linols.columns if len(self.linols.image) else 0
 
     def data(self, index: QModelIndex, role):
         if role == Qt.ItemDataRole.DisplayRole:
-            value = self._data[index.row()][index.column()]
+            value = self.get_value(index.row(), index.column())
             return f"{value:05}" if value is not None else ""
 
         if role == Qt.ItemDataRole.TextAlignmentRole:
             return Qt.AlignmentFlag.AlignCenter
 
-        value = self._data[index.row()][index.column()]
-
-        if role == Qt.ItemDataRole.ForegroundRole:
-            color = self.linols.text_addons.highlight_difference(value, index.row(), index.column())
-            if color == "blue":
-                return QColor(Qt.GlobalColor.blue)
-            elif color == "red":
-                return QColor(Qt.GlobalColor.red)
-            elif color == "default":
-                return QColor(Qt.GlobalColor.white)
-
-        if role == Qt.ItemDataRole.BackgroundRole: # highlight user maps
-            index = (index.row() * self.linols.columns) + index.column()
-
-            if self.linols.map_list_counter > 0:
-                # user creted maps
-                for i in range(len(self.linols.start_index_maps)):
-                    down_limit = self.linols.start_index_maps[i] + self.linols.shift_count
-                    up_limit = self.linols.end_index_maps[i] + self.linols.shift_count
-                    if down_limit <= index <= up_limit:
-                        return QColor(133, 215, 242, 150) # light blue
-
-            # potential maps
-            for i in range(len(self.linols.potential_maps_start)):
-                down_limit = self.linols.potential_maps_start[i]
-                up_limit = self.linols.potential_maps_end[i]
-                if down_limit <= index <= up_limit:
-                    return QColor(1, 133, 123, 150) # teal green
+        if role == Qt.ItemDataRole.ForegroundRole: # colour changed values
+            index = self.image_index(index.row(), index.column())
+            if 0 <= index < len(self.linols.image):
+                return self.diff_colors[self.linols.image.diff[index]]
+
+        if role == Qt.ItemDataRole.BackgroundRole: # highlight user and potential maps
+            index = self.image_index(index.row(), index.column())
+            if 0 <= index < len(self.regions):
+                return self.region_colors.get(self.regions[index])
 
     def setData(self, index: QModelIndex, value, role):
         if role == Qt.ItemDataRole.EditRole:
             row, col = index.row(), index.column()
             try:
                 new_value = int(value)
-                old_value = self._data[row][col]
+                old_value = self.get_value(row, col)
                 if (new_value < 0) or (new_value > 65535) or old_value is None:
-                    if old_value is None:
-                        self._data[row][col]
-                    else:
-                        self._data[row][col] = self.linols.text_addons.revert_value(row, col)
+                    if old_value is not None:
+                        self.set_value(row, col, self.linols.text_addons.revert_value(row, col))
                 else:
-                    self._data[row][col] = new_value
-                    self.redraw_canvas_2d(row, col, new_value)
-                self.undo_stack.append((row, col, old_value))
-                self.redo_stack.clear()
-                self.dataChanged.emit(index, index)
+                    self.set_value(row, col, new_value)
+                    self.redraw_canvas_2d()
             except ValueError:
                 return False
         return True
 
-    def redraw_canvas_2d(self, row, col, value):
-        self.linols.current_values = list(self.linols.current_values)
-        index = (row * self.linols.columns) + col
+    def update_regions(self): # rebuild the region of every value after maps were removed or replaced
+        regions = np.zeros(len(self.linols.image), dtype=np.uint8)
+
+        potential_maps = self.linols.potential_maps
+        for start, end in zip(potential_maps.starts.tolist(), potential_maps.ends.tolist()):
+            regions[start:end + 1] = POTENTIAL_MAP
+
+        for start, end in zip(self.linols.start_index_maps, self.linols.end_index_maps):
+            regions[max(start, 0):end + 1] = USER_MAP
+
+        self.regions = regions
+        self.refresh_values()
+
+    def add_region(self, start, end): # mark a new user map without a rebuild
+        if len(self.regions) != len(self.linols.image):
+            self.update_regions()
+            return
+
+        self.regions[max(start, 0):end + 1] = USER_MAP
+        self.refresh_values()
+
+    def image_index(self, row, col):
+        return (row * self.linols.columns) + col - self.linols.shift_count
+
+    def get_value(self, row, col):
+        index = self.image_index(row, col)
+        if index < 0 or index >= len(self.linols.image): # cells outside of the file
+            return None
+        return int(self.linols.image.current[index])
+
+    def set_value(self, row, col, value):
+        if value is not None:
+            self.write(self.image_index(row, col), value)
+
+    def write(self, indexes, values): # change image values and repaint only the rows they are in
+        self.refresh_range(self.linols.image.write(indexes, values))
+
+    def refresh_range(self, changed): # changed is the first and last image index, or None
+        if changed is None:
+            return
+
+        first = changed[0] + self.linols.shift_count
+        last = changed[1] + self.linols.shift_count
+        first_row, last_row = first // self.linols.columns, last // self.linols.columns
+
+        if first_row == last_row:
+            first_col, last_col = first % self.linols.columns, last % self.linols.columns
+        else:
+            first_col, last_col = 0, self.linols.columns - 1
 
-        self.linols.current_values[index] = value
+        self.dataChanged.emit(self.index(first_row, first_col), self.index(last_row, last_col))
+
+        self.linols.potential_maps_manager.rescan(changed) # maps can appear or vanish with the new values
+
+    def redraw_canvas_2d(self):
+        if self.linols.disable_2d_canvas: # 2d tab is hidden, it is drawn when it gets shown
+            return
 
         self.linols.sync_2d_scroll = True
-        self.linols.mode2d.draw_canvas(self.linols)
+        self.linols.redraw.request("2d")
 
     def flags(self, index: QModelIndex):
         return super().flags(index) | Qt.ItemFlag.ItemIsEditable
 
-    def set_data(self, data):
-        self._data = [list(row) for row in data]
+    def refresh_layout(self): # columns, shift or file changed
+        self.layoutAboutToBeChanged.emit()
         self.layoutChanged.emit()
 
-    def setVerticalHeaderLabels(self, labels):
-        self._vertical_header_labels = labels
-        self.headerDataChanged.emit(Qt.Orientation.Vertical, 0, self.rowCount() - 1)
+    def refresh_values(self): # repaint every cell from the image buffer, the layout stays the same
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
 
     def headerData(self, section, orientation, role):
         if role == Qt.ItemDataRole.DisplayRole:
             if orientation == Qt.Orientation.Vertical:
-                return self._vertical_header_labels[section] if section < len(self._vertical_header_labels) else ""
+                return f"{(section * self.linols.columns) * 2:06X}" # hex address of the first cell in the row
         return super().headerData(section, orientation, role)
 
     def flags(self, index: QModelIndex):
         return super().flags(index) | Qt.ItemFlag.ItemIsEditable
 
-    def get_all_data(self):
-        return self._data
-
     def undo_changes(self):
-        if not self.linols.file_path:
-            QMessageBox.warning(self.linols, "Warning", "No file is currently open. Please open a file first.")
-            return
-
-        if not self.undo_stack:
-            return
-
-        row, col, old_value = self.undo_stack.pop()
-
-        current_value = self._data[row][col]
-        self.redo_stack.append((row, col, current_value))
-
-        self._data[row][col] = old_value
-
-        index = self.index(row, col)
-        self.dataChanged.emit(index, index)
+        self.apply_journal(True)
 
     def redo_changes(self):
+        self.apply_journal(False)
+
+    def apply_journal(self, undo): # undo or redo the last action of any view
         if not self.linols.file_path:
             QMessageBox.warning(self.linols, "Warning", "No file is currently open. Please open a file first.")
             return
 
-        if not self.redo_stack:
+        journal = self.linols.image.journal
+        changed = journal.undo() if undo else journal.redo()
+        if changed is None:
             return
 
-        row, col, old_value = self.redo_stack.pop()
-
-        current_value = self._data[row][col]
-        self.undo_stack.append((row, col, current_value))
-
-        self._data[row][col] = old_value
-
-        index = self.index(row, col)
-        self.dataChanged.emit(index, index)
\ No newline at end of file
+        self.refresh_range(changed)
+        self.redraw_canvas_2d()
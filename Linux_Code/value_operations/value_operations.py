@@ -0,0 +1,62 @@
+import numpy as np
+
+LOW = 0
+HIGH = 65535
+
+OPERATIONS = { # operation and the number of operands it takes
+    "=": (1,),
+    "+": (1,),
+    "-": (1,),
+    "%": (1,),
+    "*": (1,),
+    "Clamp": (2,), # lowest and highest allowed value
+    "Lin": (0, 2), # values of the first and last cell, the current ones when left out
+}
+
+POLICIES = ("Reject", "Clamp", "Wrap") # what happens to results outside of LOW - HIGH
+
+
+def evaluate(values, operation, operands=(), policy="Reject", integer=True):
+    # new values for the whole array at once, raises ValueError before anything could be written
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation {operation}!")
+    if len(operands) not in OPERATIONS[operation]:
+        counts = " or ".join(str(count) for count in OPERATIONS[operation])
+        raise ValueError(f"Operation {operation} needs {counts} value(s)!")
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown overflow policy {policy}!")
+
+    values = np.asarray(values, dtype=np.float64)
+
+    if operation == "=":
+        result = np.full_like(values, operands[0])
+    elif operation == "+":
+        result = values + operands[0]
+    elif operation == "-":
+        result = values - operands[0]
+    elif operation == "%":
+        change = values * (operands[0] / 100.0)
+        result = values + (np.trunc(change) if integer else change)
+    elif operation == "*":
+        result = values * operands[0]
+    elif operation == "Clamp":
+        result = np.clip(values, min(operands), max(operands))
+    else:
+        start, end = operands if operands else (values[:1].sum(), values[-1:].sum())
+        result = np.linspace(start, end, len(values))
+        if integer:
+            result = np.rint(result) # nearest value instead of always rounding down on a ramp
+
+    if integer:
+        result = np.trunc(result) # like int()
+
+    outside = (result < LOW) | (result > HIGH)
+    if np.any(outside):
+        if policy == "Reject":
+            raise ValueError(f"{np.count_nonzero(outside)} value(s) would be outside of {LOW} - {HIGH}!")
+        elif policy == "Clamp":
+            result = np.clip(result, LOW, HIGH)
+        else:
+            result = np.mod(result - LOW, HIGH - LOW + 1) + LOW
+
+    return result
@@ -1,5 +1,3 @@
-import math
-import re
 from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import QTableWidgetItem, QMessageBox, QApplication, QInputDialog
 
@@ -13,32 +11,13 @@ class Mode3D:
             QMessageBox.warning(self.ui, "Warning", "Data selection is not correct!")
             return
 
-        selected_items = self.ui.box_layout.selectedItems()
+        from clipboard_codec.clipboard_codec import encode
 
-        last_row = -1 # for storing previous row
+        selected_items = self.ui.box_layout.selectedItems()
 
         clipboard = QApplication.clipboard()
         clipboard.clear()
-
-        text_values = ""
-
-        for item in selected_items:
-            row = item.row() # current row
-            col = item.column() # current column
-
-            entry = self.ui.box_layout.item(row, col)
-            value = entry.text()
-
-            if last_row == -1:
-                text_values += value
-            elif row == last_row:
-                text_values += '\t' + value
-            else:
-                text_values += '\n' + value
-
-            last_row = row
-
-        clipboard.setText(text_values)
+        clipboard.setText(encode([item.text() for item in selected_items], [item.row() for item in selected_items]))
 
     def check_selection_rectangle_3d(self):
         selected_items = self.ui.box_layout.selectedItems()
@@ -93,110 +72,45 @@ class Mode3D:
         return True
 
 
-    def increase_selected_text(self, int_value):
-        try:
-            increase_value = int_value
-            selected_items = self.ui.box_layout.selectedItems()
-            if not selected_items:
-                return
+    def format_map_value(self, value):
+        if not self.ui.map_decimal:
+            return f"{int(value):05}"
 
-            for i in range(len(selected_items)):
-                row = selected_items[i].row()
-                col = selected_items[i].column()
-                entry = self.ui.box_layout.item(row, col)
-                if not self.ui.map_decimal:
-                    current_value = int(entry.text())
-                else:
-                    current_value = float(entry.text().strip())
-                new_value = current_value + increase_value
-                if 0 > new_value or new_value > 65535:
-                    raise ValueError
-                if not self.ui.map_decimal:
-                    new_value_str = f"{new_value:05}"
-                    entry.setText(new_value_str)
-                else:
-                    new_data = float(round(new_value, self.map_precision))
-                    parts = str(new_data).split('.')
-                    decimal_length = len(parts[1])
-                    str_data = str(new_data)
-                    if decimal_length < self.map_precision:
-                        for x in range(self.map_precision - decimal_length):
-                            str_data += "0"
-                    parts = str_data.split('.')
-                    entry.setText(f"{int(parts[0]):05}.{parts[1]}")
+        new_data = float(round(value, self.map_precision))
+        parts = str(new_data).split('.')
+        decimal_length = len(parts[1])
+        str_data = str(new_data)
+        if decimal_length < self.map_precision:
+            for x in range(self.map_precision - decimal_length):
+                str_data += "0"
+        parts = str_data.split('.')
+        return f"{int(parts[0]):05}.{parts[1]}"
 
-                self.check_difference(row, col)
+    def apply_operation(self, operation, operands, policy="Reject"):
+        from value_operations.value_operations import evaluate
 
-        except ValueError:
-            QMessageBox.warning(self.ui, "Warning", "Please enter a valid number.")
+        selected_items = sorted(self.ui.box_layout.selectedItems(), key=lambda item: (item.row(), item.column()))
+        if not selected_items:
+            QMessageBox.warning(self.ui, "Warning", "There is no values selected!")
+            return False
 
-    def increase_selected_text_per(self, float_value):
         try:
-            percentage_increase = float_value / 100.0
-            selected_items = self.ui.box_layout.selectedItems()
-            if not selected_items:
-                return
-
-            for i in range(len(selected_items)):
-                row = selected_items[i].row()
-                col = selected_items[i].column()
-                entry = self.ui.box_layout.item(row, col)
-                if not self.ui.map_decimal:
-                    current_value = int(entry.text())
-                    increase_value = int(current_value * percentage_increase)
-                else:
-                    current_value = float(entry.text())
-                    increase_value = float(current_value * percentage_increase)
-                new_value = current_value + increase_value
-                if 0 > new_value or new_value > 65535:
-                    raise ValueError
-                if not self.ui.map_decimal:
-                    new_value_str = f"{math.ceil(new_value):05}"
-                    entry.setText(new_value_str)
-                else:
-                    new_data = float(round(math.ceil(new_value), self.map_precision))
-                    parts = str(new_data).split('.')
-                    decimal_length = len(parts[1])
-                    str_data = str(new_data)
-                    if decimal_length < self.map_precision:
-                        for x in range(self.map_precision - decimal_length):
-                            str_data += "0"
-                    parts = str_data.split('.')
-                    entry.setText(f"{int(parts[0]):05}.{parts[1]}")
-
-                self.check_difference(row, col)
-
+            values = [float(item.text().strip()) for item in selected_items]
         except ValueError:
             QMessageBox.warning(self.ui, "Warning", "Please enter a valid number.")
+            return False
 
-    def set_text(self, int_value):
         try:
-            selected_items = self.ui.box_layout.selectedItems()
-            if not selected_items:
-                return
+            new_values = evaluate(values, operation, operands, policy, not self.ui.map_decimal)
+        except ValueError as e:
+            QMessageBox.warning(self.ui, "Warning", str(e))
+            return False
 
-            for i in range(len(selected_items)):
-                row = selected_items[i].row()
-                col = selected_items[i].column()
-                entry = self.ui.box_layout.item(row, col)
-                if not self.ui.map_decimal:
-                    new_value = int_value
-                    new_value_str = f"{new_value:05}"
-                    entry.setText(new_value_str)
-                else:
-                    new_data = float(round(int_value, self.map_precision))
-                    parts = str(new_data).split('.')
-                    decimal_length = len(parts[1])
-                    str_data = str(new_data)
-                    if decimal_length < self.map_precision:
-                        for x in range(self.map_precision - decimal_length):
-                            str_data += "0"
-                    parts = str_data.split('.')
-                    entry.setText(f"{int(parts[0]):05}.{parts[1]}")
-                self.check_difference(row, col)
+        for item, new_value in zip(selected_items, new_values):
+            item.setText(self.format_map_value(new_value))
+            self.check_difference(item.row(), item.column())
 
-        except ValueError:
-            QMessageBox.warning(self.ui, "Warning", "Please enter a valid number.")
+        return True
 
     def resize_grid(self, new_columns, new_rows, new):
         self.ui.num_columns_3d = new_columns
@@ -292,62 +206,22 @@ class Mode3D:
 
             self.adjust_row_width(x_precision)
         else:
-            clipboard = QApplication.clipboard()
-            clipboard_text = clipboard.text()  # get text from clipboard
-
-            if clipboard_text[-1] == '\n':
-                clipboard_text = clipboard_text[:-1]
-
-            values_clipboard = re.split(r'[\t\n]', clipboard_text)
+            from clipboard_codec.clipboard_codec import decode
 
-            length_of_original = (sum(len(sublist) for sublist in self.ui.original))
+            try:
+                values = decode(QApplication.clipboard().text(), self.ui.map_decimal)[0]
+            except ValueError:
+                QMessageBox.warning(self.ui, "Warning", "Data is not correct!")
+                return
 
-            if len(values_clipboard) != length_of_original:
+            if len(values) != self.ui.num_rows_3d * self.ui.num_columns_3d:
                 QMessageBox.warning(self.ui, "Warning", "Data size is not right!")
                 return
 
-            for i in range(len(values_clipboard)):
-                try:
-                    int(values_clipboard[i])
-                except ValueError:
-                    QMessageBox.warning(self.ui, "Warning", "Data is not correct!")
-                    return
-
-            x = 0
-            row_start = 0
-            col_start = 0
-
-            for i in range(len(clipboard_text)):
-                if x >= len(values_clipboard):
-                    break
-
-                if clipboard_text[i] == '\t':
-                    item = self.ui.box_layout.item(row_start, col_start)
-                    if item:
-                        int_val = int(values_clipboard[x])
-                        item.setText(f"{int_val:05}")
-                    x += 1
-
-                    if col_start + 1 >= self.ui.columns:
-                        row_start += 1
-                        col_start = 0
-                    else:
-                        col_start += 1
-
-                elif clipboard_text[i] == '\n':
-                    item = self.ui.box_layout.item(row_start, col_start)
-                    if item:
-                        int_val = int(values_clipboard[x])
-                        item.setText(f"{int_val:05}")
-                    x += 1
-
-                    row_start += 1
-                    col_start = 0
-
-            item = self.ui.box_layout.item(row_start, col_start)
-            if item:
-                int_val = int(values_clipboard[x])
-                item.setText(f"{int_val:05}")
+            for index, value in enumerate(values.tolist()):
+                item = self.ui.box_layout.item(*divmod(index, self.ui.num_columns_3d))
+                if item:
+                    item.setText(self.format_map_value(value))
 
     def paste_x_data(self, maps, data, new):
         if maps:
@@ -627,10 +501,12 @@ class Mode3D:
             entry.setForeground(QColor("white"))
 
     def paste_map(self):
+        from clipboard_codec.clipboard_codec import split_rows
+
         clipboard = QApplication.clipboard()
         clipboard_text = clipboard.text()
 
-        striped_text = [list(re.split(r'[\t]+', line)) for line in clipboard_text.strip().split('\n')]
+        striped_text = split_rows(clipboard_text)
 
         x_axis_data = striped_text[0]
 
@@ -646,10 +522,7 @@ class Mode3D:
 
         self.paste_y_data(False, [], False)
 
-        map_values = ""
-        for i in range(1, len(striped_text)):
-            row_text = '\t'.join(striped_text[i][1:])
-            map_values += row_text + '\n'
+        map_values = '\n'.join(['\t'.join(row[1:]) for row in striped_text[1:]])
 
         clipboard.setText(map_values)
 
@@ -664,7 +537,7 @@ class Mode3D:
         x_axis_values = self.copy_x_axis()
         y_axis_values = self.copy_y_axis()
 
-        map_values = "\t" + "\t".join(x_axis_values) + "\n"
+        rows = [[""] + x_axis_values]
 
         for i in range(self.ui.box_layout.rowCount()):
             row_values = [y_axis_values[i]]
@@ -675,9 +548,9 @@ class Mode3D:
                 else:
                     row_values.append("")
 
-            map_values += "\t".join(row_values) + "\n"
+            rows.append(row_values)
 
-        clipboard.setText(map_values.strip('\n'))
+        clipboard.setText("\n".join(["\t".join(row_values) for row_values in rows]))
 
     def copy_x_axis(self):
         values_data = []
@@ -818,70 +691,39 @@ class Mode3D:
             QMessageBox.warning(self.ui, "Warning", "No item selected!")
             return
 
-        first_item = selected_items[0]  # first selected item
-        row_ori = first_item.row()  # current row
-        col_ori = first_item.column()  # current column
-
-        clipboard = QApplication.clipboard()
-        clipboard_text = clipboard.text()  # get text from clipboard
-
-        if clipboard_text[-1] == '\n':
-            clipboard_text = clipboard_text[:-1]
-
-        values_clipboard = re.split(r'[\t\n]', clipboard_text)
+        from clipboard_codec.clipboard_codec import decode
 
-        index = (row_ori * self.ui.num_columns_3d) + col_ori
+        row_ori = min(item.row() for item in selected_items) # first selected cell
+        col_ori = min(item.column() for item in selected_items if item.row() == row_ori)
 
-        length_of_original = (sum(len(sublist) for sublist in self.ui.original))
-
-        end_length = len(values_clipboard) + index
+        try:
+            values, row_lengths = decode(QApplication.clipboard().text(), self.ui.map_decimal)
+        except ValueError:
+            QMessageBox.warning(self.ui, "Warning", "Data is not correct!")
+            return
 
-        if length_of_original < end_length:
+        # every clipboard row starts below the previous one at the first selected column,
+        # values past the last column continue in the next row
+        cells = []
+        row = row_ori
+        for length in row_lengths.tolist():
+            col = col_ori
+            for i in range(length):
+                if col >= self.ui.num_columns_3d:
+                    row += 1
+                    col = 0
+                cells.append((row, col))
+                col += 1
+            row += 1
+
+        if cells[-1][0] >= self.ui.num_rows_3d:
             QMessageBox.warning(self.ui, "Warning", "Data size is not right!")
             return
 
-        for i in range(len(values_clipboard)):
-            try:
-                int(values_clipboard[i])
-            except ValueError:
-                QMessageBox.warning(self.ui, "Warning", "Data is not correct!")
-                return
-
-        x = 0
-        row_start = row_ori
-        col_start = col_ori
-
-        for i in range(len(clipboard_text)):
-            if x >= len(values_clipboard):
-                break
-
-            if clipboard_text[i] == '\t':
-                item = self.ui.box_layout.item(row_start, col_start)
-                if item:
-                    int_val = int(values_clipboard[x])
-                    item.setText(f"{int_val:05}")
-                x += 1
-
-                if col_start + 1 >= self.ui.columns:
-                    row_start += 1
-                    col_start = 0
-                else:
-                    col_start += 1
-
-            elif clipboard_text[i] == '\n':
-                item = self.ui.box_layout.item(row_start, col_start)
-                if item:
-                    int_val = int(values_clipboard[x])
-                    item.setText(f"{int_val:05}")
-                x += 1
-
-                row_start += 1
-                col_start = col_ori
-
-        item = self.ui.box_layout.item(row_start, col_start)
-        if item:
-            int_val = int(values_clipboard[x])
-            item.setText(f"{int_val:05}")
+        for (row, col), value in zip(cells, values.tolist()):
+            item = self.ui.box_layout.item(row, col)
+            if item:
+                item.setText(self.format_map_value(value))
 
     def on_selection_3d(self):
         selected_items = self.ui.box_layout.selectedItems()
@@ -0,0 +1,47 @@
+import numpy as np
+
+LOW = 0
+HIGH = 65535
+
+
+def normalize(text): # unix new lines, no empty rows or cells around the data
+    return text.replace('\r\n', '\n').replace('\r', '\n').strip()
+
+
+def split_rows(text): # rows of tab separated tokens
+    return [line.split('\t') for line in normalize(text).split('\n')]
+
+
+def encode(tokens, rows):
+    # text tokens with the same row number are joined by tabs, rows by new lines
+    tokens = list(tokens)
+    if not tokens:
+        return ""
+
+    separators = ['\n' if new_row else '\t' for new_row in (np.diff(np.asarray(rows)) != 0).tolist()]
+
+    parts = [None] * (2 * len(tokens) - 1)
+    parts[::2] = tokens
+    parts[1::2] = separators
+
+    return ''.join(parts)
+
+
+def decode(text, decimal=False):
+    # values of all rows as one flat array and the number of values in every row,
+    # raises ValueError for empty cells, text or values outside of LOW - HIGH
+    text = normalize(text)
+
+    row_lengths = np.array([line.count('\t') + 1 for line in text.split('\n')], dtype=np.int64)
+    values = np.array(text.replace('\n', '\t').split('\t'), dtype=np.float64)
+
+    if not np.all(np.isfinite(values)) or np.any((values < LOW) | (values > HIGH)):
+        raise ValueError("Values are outside of the allowed range")
+
+    if decimal:
+        return values, row_lengths
+
+    if np.any(values != np.trunc(values)):
+        raise ValueError("Values are not whole numbers")
+
+    return values.astype(np.uint16), row_lengths
@@ -49,28 +49,29 @@ class DifferenceDialog(QDialog):
 
     def get_diff_data(self):
         data = []
-        new_values = self.ui.current_values[self.ui.shift_count:]
+        unpacked = self.ui.image.original
+        new_values = self.ui.image.current
         counter = 0
-        for i in range(len(new_values)):
-            if new_values[i] != self.ui.unpacked[i]:
-                ori_val = self.ui.unpacked[i]
-                new_val = new_values[i]
-                hex_address = i * 2
+        for i in self.ui.image.runs.indexes(): # changed blocks, the image is not scanned
+            ori_val = int(unpacked[i])
+            new_val = int(new_values[i])
 
-                diff_value = self.ui.unpacked[i] - new_values[i]
+            hex_address = int(i) * 2
 
-                if ori_val == 0:
-                    percentage_difference = 100.0
-                else:
-                    percentage_difference = ((new_val - ori_val) / ori_val) * 100
+            diff_value = ori_val - new_val
 
-                    if percentage_difference > 999.0:
-                        percentage_difference = 999.0
+            if ori_val == 0:
+                percentage_difference = 100.0
+            else:
+                percentage_difference = ((new_val - ori_val) / ori_val) * 100
 
-                per_diff_str = f"{round(percentage_difference, 2)}%"
+                if percentage_difference > 999.0:
+                    percentage_difference = 999.0
 
-                data.append([counter + 1, f"{hex_address:06X}", ori_val, new_val, diff_value, per_diff_str])
-                counter += 1
+            per_diff_str = f"{round(percentage_difference, 2)}%"
+
+            data.append([counter + 1, f"{hex_address:06X}", ori_val, new_val, diff_value, per_diff_str])
+            counter += 1
 
         return data
 
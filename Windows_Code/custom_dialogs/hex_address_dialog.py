@@ -89,7 +89,7 @@ class HexAddressDialog(QDialog):
             if index % 2 != 0:
                 raise ValueError
             index = index // 2
-            if index < 0 or index > len(self.ui.unpacked):
+            if index < 0 or index >= len(self.ui.image):
                 raise ValueError
         except ValueError:
             QMessageBox.critical(self, "Error", "Please enter a valid hex address!")
@@ -1,5 +1,7 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QMessageBox, QApplication
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QMessageBox, QApplication, \
+    QComboBox
 from PyQt6.QtCore import Qt
+from value_operations.value_operations import OPERATIONS, POLICIES
 import os
 
 class ValueDialog3D(QDialog):
@@ -34,7 +36,7 @@ class ValueDialog3D(QDialog):
                 """
 
         self.setWindowTitle("Value Changer")
-        self.setFixedSize(250, 150)
+        self.setFixedSize(300, 190)
         self.setStyleSheet("background-color: #333;")
 
         self.setWindowIcon(self.ui.logo_icon)
@@ -64,12 +66,14 @@ class ValueDialog3D(QDialog):
         main_layout.addWidget(self.entry)
 
         button_layout = QHBoxLayout()
+        button_layout_2 = QHBoxLayout()
 
         buttons = [
             ("=", self.change_value),
             ("+", self.change_value),
             ("-", self.change_value),
-            ("%", self.change_value)
+            ("%", self.change_value),
+            ("*", self.change_value)
         ]
         for text, func in buttons:
             button = QPushButton(text, self)
@@ -77,7 +81,27 @@ class ValueDialog3D(QDialog):
             button.clicked.connect(lambda checked, val=text, btn=button: func(val, btn))
             button_layout.addWidget(button)
 
+        for text in ("Clamp", "Lin"):
+            button = QPushButton(text, self)
+            button.setStyleSheet(button_style)
+            button.clicked.connect(lambda checked, val=text, btn=button: self.change_value(val, btn))
+            button_layout_2.addWidget(button)
+
+        self.policy = QComboBox(self) # what happens to results outside of 0 - 65535
+        self.policy.addItems(POLICIES)
+        self.policy.setStyleSheet("""
+            border-radius: 5px;
+            font-family: 'Roboto';
+            font-size: 12px;
+            font-weight: 650;
+            background-color: #555;
+            color: white;
+            padding: 4px;
+        """)
+        button_layout_2.addWidget(self.policy)
+
         main_layout.addLayout(button_layout)
+        main_layout.addLayout(button_layout_2)
 
         ok_button = QPushButton("Ok", self)
         ok_button.setStyleSheet(button_style)
@@ -90,6 +114,14 @@ class ValueDialog3D(QDialog):
             self.selected_button.setEnabled(True)
         self.selected_button = button
         self.selected_button.setEnabled(False)
+
+        if value == "Clamp":
+            self.entry.setPlaceholderText("lowest highest")
+        elif value == "Lin":
+            self.entry.setPlaceholderText("first last (optional)")
+        else:
+            self.entry.setPlaceholderText("")
+
     def calculate(self):
         if not self.selected_value:
             entry_message = ""
@@ -98,13 +130,14 @@ class ValueDialog3D(QDialog):
             self.show_error(f"Please select an operation {entry_message}!")
             return
 
-        if self.entry.text() == "":
+        if self.entry.text() == "" and 0 not in OPERATIONS[self.selected_value]:
             self.show_error("Please enter a value in the entry box!")
             return
 
         try:
-            value = float(self.entry.text().strip()) if self.ui.map_decimal else int(self.entry.text())
-            if value < 0 or value > 65535:
+            # results of maps without decimals are made whole by evaluate, like in the text view
+            operands = [float(text) for text in self.entry.text().split()]
+            if any(value < 0 or value > 65535 for value in operands):
                 raise ValueError
         except ValueError:
             self.show_error("Please enter a valid number")
@@ -115,14 +148,8 @@ class ValueDialog3D(QDialog):
             self.close()
             return
 
-        if self.selected_value == "=":
-            self.ui.mode3d.set_text(value)
-        elif self.selected_value == "+":
-            self.ui.mode3d.increase_selected_text(value)
-        elif self.selected_value == "-":
-            self.ui.mode3d.increase_selected_text(value * -1)
-        elif self.selected_value == "%":
-            self.ui.mode3d.increase_selected_text_per(value)
+        if not self.ui.mode3d.apply_operation(self.selected_value, operands, self.policy.currentText()):
+            return # keep the dialog open, the value or the overflow policy can be changed
 
         self.ui.dialog_terminate = False
         self.close()
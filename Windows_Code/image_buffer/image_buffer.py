@@ -0,0 +1,188 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+from image_buffer.image_journal import ImageJournal
+from image_buffer.image_pyramid import ImagePyramid
+from image_buffer.change_runs import ChangeRuns
+
+
+class ImageBuffer:
+    def __init__(self):
+        self.file_path = "" # path of the mapped file
+        self.original_bytes = np.zeros(0, dtype=np.uint8) # read-only map of the original file
+        self.current_bytes = np.zeros(0, dtype=np.uint8) # copy-on-write working bytes
+        self.saved_path = "" # last file written by save
+        self.saved_bytes = None # bytes written to saved_path
+        self.saved_stat = None # size and modification time of saved_path after the save
+        self.journal = ImageJournal(self) # undo and redo of every write
+        self.pyramid = None # min/max overview of the current values, built when it is first shown
+        self.runs = ChangeRuns() # blocks of changed values, follow the diff
+        self.low_high = True # byte order of the words, sets the typed views
+
+    def __len__(self):
+        return len(self.original)
+
+    def dtype(self):
+        return np.dtype('<u2') if self.low_high else np.dtype('>u2')
+
+    @property
+    def low_high(self):
+        return self._low_high
+
+    @low_high.setter
+    def low_high(self, low_high):
+        self._low_high = low_high
+
+        # typed views over the same raw bytes, nothing is copied and pending edits are kept
+        self.original = self.original_bytes.view(self.dtype())
+        self.current = self.current_bytes.view(self.dtype())
+        self.update_diff() # differences change sign with the byte order
+
+    def open(self, file_path, low_high):
+        size = os.path.getsize(file_path)
+        if size == 0 or size % 2 != 0:
+            raise ValueError(f"Invalid file size: {size} bytes")
+
+        self.file_path = file_path
+
+        # both arrays map the same file, pages of the working array are only copied when they get edited
+        self.original_bytes = np.memmap(file_path, dtype=np.uint8, mode='r')
+        self.current_bytes = np.memmap(file_path, dtype=np.uint8, mode='c')
+        self.low_high = low_high
+
+        self.saved_path = ""
+        self.saved_bytes = None
+        self.saved_stat = None
+
+    def update_diff(self, indexes=None):
+        # sign of current - original for every value: 1 increased, -1 decreased, 0 unchanged
+        # the change runs and the overview follow every change of the current values too
+        if indexes is None:
+            self.diff = np.sign(self.current.astype(np.int32) - self.original).astype(np.int8)
+            self.runs.rebuild(self.diff)
+            self.pyramid = None
+        else:
+            self.diff[indexes] = np.sign(self.current[indexes].astype(np.int32) - self.original[indexes])
+
+            changed = self.journal.bounds(indexes)
+            if changed is not None:
+                self.runs.update(self.diff, *changed)
+                if self.pyramid is not None:
+                    self.pyramid.update(*changed)
+
+    def overview(self):
+        if self.pyramid is None:
+            self.pyramid = ImagePyramid(self.current)
+        return self.pyramid
+
+    def write(self, indexes, values): # every edit goes through here so the diff and the journal stay in sync
+        # returns the first and last written index, or None
+        indexes = self.journal.compact(indexes, len(self))
+        changed = self.journal.bounds(indexes)
+        if changed is None: # nothing to write, the redo steps are kept
+            return None
+
+        old_values = self.current[indexes].copy()
+
+        self.current[indexes] = values
+        self.update_diff(indexes)
+
+        self.journal.record(indexes, old_values, self.current[indexes].copy())
+
+        return changed
+
+    def detach(self): # keep the values in memory so the mapped file can be overwritten
+        if isinstance(self.original_bytes, np.memmap):
+            self.original_bytes = np.array(self.original_bytes)
+            self.current_bytes = np.array(self.current_bytes)
+            self.low_high = self.low_high
+
+    def save(self, file_path, in_place=False):
+        # the file is written next to the target and renamed over it, in_place only rewrites the bytes changed
+        # since the last save into that file, faster for large files but a crash or a full disk during the
+        # write leaves a half written file, callers opt in
+        if self.file_path and os.path.exists(file_path) and os.path.samefile(file_path, self.file_path):
+            self.detach()
+
+        if in_place and self.can_patch(file_path):
+            self.patch_file(file_path)
+        else:
+            self.write_file(file_path)
+
+        self.saved_path = file_path
+        self.saved_bytes = np.array(self.current_bytes)
+        stat = os.stat(file_path)
+        self.saved_stat = (stat.st_size, stat.st_mtime_ns)
+
+    def can_patch(self, file_path):
+        # only patch a file we wrote ourselves and that has not been touched since
+        if not hasattr(os, "pwrite") or self.saved_bytes is None or file_path != self.saved_path:
+            return False
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == self.saved_stat and stat.st_size == len(self.current_bytes)
+
+    def write_file(self, file_path):
+        # write next to the target and rename, a crash never leaves a half written file
+        directory = os.path.dirname(os.path.abspath(file_path))
+        fd, temp_path = tempfile.mkstemp(prefix=".linols_", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(memoryview(self.current_bytes))
+                file.flush()
+                os.fsync(file.fileno())
+            if os.path.exists(file_path):
+                shutil.copymode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def patch_file(self, file_path):
+        # rewrite only the byte ranges changed since the last save, not atomic
+        changed = np.flatnonzero(self.current_bytes != self.saved_bytes)
+        if not len(changed):
+            return
+
+        breaks = np.flatnonzero(np.diff(changed) > 1)
+        starts = changed[np.r_[0, breaks + 1]]
+        ends = changed[np.r_[breaks, len(changed) - 1]] + 1
+
+        fd = os.open(file_path, os.O_WRONLY)
+        try:
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                os.pwrite(fd, memoryview(self.current_bytes[start:end]), start)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def import_values(self, file_path):
+        values = np.fromfile(file_path, dtype=self.dtype())
+        if len(values) != len(self.current):
+            raise ValueError("Imported file does not match the size of the opened file")
+
+        changed = np.flatnonzero(self.current != values) # only the differences are journaled
+        return self.write(changed, values[changed])
+
+    def find(self, values, start=0, reverse=False):
+        # returns the first index at or after start (at or before start when reverse) where values begin, or None
+        values = np.asarray(values, dtype=np.int64)
+        count = len(self.current) - len(values) + 1
+        if count <= 0:
+            return None
+
+        mask = self.current[:count] == values[0]
+        for i in range(1, len(values)):
+            mask &= self.current[i:count + i] == values[i]
+
+        found = np.flatnonzero(mask)
+        if reverse:
+            found = found[found <= start]
+            return int(found[-1]) if len(found) else None
+
+        found = found[found >= start]
+        return int(found[0]) if len(found) else None
@@ -0,0 +1,108 @@
+import hashlib
+import struct
+import numpy as np
+
+MAGIC = b"LPAT"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ32sI") # magic, version, reserved, image words, base image hash, run count
+MAX_GAP = 2 # unchanged words joined into a run when that is smaller than starting a new run
+HASH_CHUNK = 4 << 20 # bytes hashed at once, a mapped file is read piece by piece
+
+
+def image_hash(raw_bytes):
+    digest = hashlib.sha256()
+    view = memoryview(raw_bytes)
+    for position in range(0, len(view), HASH_CHUNK):
+        digest.update(view[position:position + HASH_CHUNK])
+    return digest.digest()
+
+
+def run_indexes(starts, lengths):
+    # word index of every value covered by the runs
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(int(lengths.sum()), dtype=np.int64) - np.repeat(offsets, lengths) + np.repeat(starts, lengths)
+
+
+class ImagePatch:
+    def __init__(self, size, base_hash, starts, lengths, old_words, new_words):
+        self.size = size # words in the base image
+        self.base_hash = base_hash # sha256 of the base image bytes
+        self.starts = starts # first word of every run
+        self.lengths = lengths # words in every run
+        self.old_words = old_words # base words of all runs, raw bytes as '<u2'
+        self.new_words = new_words # patched words of all runs, raw bytes as '<u2'
+
+    @classmethod
+    def create(cls, original_bytes, current_bytes):
+        # words are compared as raw bytes so the patch does not depend on the display byte order
+        original = original_bytes.view('<u2')
+        current = current_bytes.view('<u2')
+
+        changed = np.flatnonzero(original != current)
+        if len(changed):
+            breaks = np.flatnonzero(np.diff(changed) > MAX_GAP + 1)
+            starts = changed[np.r_[0, breaks + 1]]
+            ends = changed[np.r_[breaks, len(changed) - 1]] + 1
+        else:
+            starts = ends = np.zeros(0, dtype=np.int64)
+
+        lengths = ends - starts
+        indexes = run_indexes(starts, lengths)
+
+        return cls(len(original), image_hash(original_bytes), starts, lengths, original[indexes], current[indexes])
+
+    @classmethod
+    def read(cls, file_path):
+        with open(file_path, 'rb') as file:
+            content = file.read()
+
+        if len(content) < HEADER.size:
+            raise ValueError("Patch file is too short")
+
+        magic, version, reserved, size, base_hash, runs = HEADER.unpack_from(content)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a supported patch file")
+
+        position = HEADER.size
+        if len(content) < position + runs * 8:
+            raise ValueError("Patch file is truncated")
+
+        starts = np.frombuffer(content, dtype='<u4', count=runs, offset=position).astype(np.int64)
+        lengths = np.frombuffer(content, dtype='<u4', count=runs, offset=position + runs * 4).astype(np.int64)
+        position += runs * 8
+
+        words = int(lengths.sum())
+        if len(content) != position + words * 4 or np.any(starts + lengths > size):
+            raise ValueError("Patch file is corrupted")
+
+        old_words = np.frombuffer(content, dtype='<u2', count=words, offset=position)
+        new_words = np.frombuffer(content, dtype='<u2', count=words, offset=position + words * 2)
+
+        return cls(size, base_hash, starts, lengths, old_words, new_words)
+
+    def write(self, file_path):
+        with open(file_path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, 0, self.size, self.base_hash, len(self.starts)))
+            file.write(self.starts.astype('<u4').tobytes())
+            file.write(self.lengths.astype('<u4').tobytes())
+            file.write(self.old_words.astype('<u2').tobytes())
+            file.write(self.new_words.astype('<u2').tobytes())
+
+    def __len__(self): # changed words, including joined gaps
+        return len(self.new_words)
+
+    def matches(self, raw_bytes): # patch was created from exactly this image
+        return len(raw_bytes) == self.size * 2 and image_hash(raw_bytes) == self.base_hash
+
+    def old_words_match(self, raw_bytes): # every patched word still holds its base value
+        return len(raw_bytes) == self.size * 2 and \
+            bool(np.array_equal(raw_bytes.view('<u2')[self.indexes()], self.old_words))
+
+    def indexes(self):
+        return run_indexes(self.starts, self.lengths)
+
+    def values(self, dtype): # patched words as seen with the given byte order
+        return self.new_words.astype('<u2').view(np.uint8).view(dtype)
+
+    def apply(self, raw_bytes):
+        raw_bytes.view('<u2')[self.indexes()] = self.new_words
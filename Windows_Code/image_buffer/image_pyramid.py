@@ -0,0 +1,59 @@
+import numpy as np
+
+BUCKET = 64 # values in a bucket of the finest level
+FACTOR = 4 # buckets of a level joined into one bucket of the next level
+
+
+def reduce_buckets(minimum, maximum, size):
+    # lowest and highest value of every group of size entries, the last group can be shorter
+    offsets = np.arange(0, len(minimum), size)
+    return np.minimum.reduceat(minimum, offsets), np.maximum.reduceat(maximum, offsets)
+
+
+class ImagePyramid:
+    # lowest and highest value of buckets of the image, every level joins FACTOR buckets of the level
+    # below, any zoom of the whole image is drawn from about one bucket per pixel
+    def __init__(self, values):
+        self.values = values
+        self.levels = [] # (minimum, maximum) arrays, a bucket of level k holds BUCKET * FACTOR ** k values
+
+        minimum, maximum = reduce_buckets(values, values, BUCKET) if len(values) else (np.zeros(0), np.zeros(0))
+        self.levels.append((minimum.astype(np.uint16), maximum.astype(np.uint16)))
+        while len(self.levels[-1][0]) > 1:
+            self.levels.append(reduce_buckets(*self.levels[-1], FACTOR))
+
+    @staticmethod
+    def bucket_size(level):
+        return BUCKET * FACTOR ** level
+
+    def update(self, first, last): # values from first to last were changed
+        low, high = first // BUCKET, last // BUCKET + 1
+        values = self.values[low * BUCKET:high * BUCKET]
+        minimum, maximum = self.levels[0]
+        minimum[low:high], maximum[low:high] = reduce_buckets(values, values, BUCKET)
+
+        for level in range(1, len(self.levels)):
+            low, high = low // FACTOR, (high - 1) // FACTOR + 1
+            minimum, maximum = self.levels[level]
+            below = self.levels[level - 1]
+            minimum[low:high], maximum[low:high] = reduce_buckets(below[0][low * FACTOR:high * FACTOR],
+                                                                  below[1][low * FACTOR:high * FACTOR], FACTOR)
+
+    def envelope(self, low, high, buckets):
+        # image position, lowest and highest value of about the given number of equal parts of [low, high)
+        size = max((high - low) // max(buckets, 1), 1)
+
+        if size < BUCKET: # close zoom, read the values themselves
+            values = self.values[low:high]
+            minimum, maximum = reduce_buckets(values, values, size)
+            return np.arange(low, high, size), minimum, maximum
+
+        # coarsest level with buckets no larger than a part, parts start on a bucket of that level
+        level = min(int(np.log(size / BUCKET) / np.log(FACTOR)), len(self.levels) - 1)
+        bucket = self.bucket_size(level)
+        minimum, maximum = self.levels[level]
+
+        first, last = low // bucket, -(-high // bucket)
+        step = max(size // bucket, 1)
+        minimum, maximum = reduce_buckets(minimum[first:last], maximum[first:last], step)
+        return np.arange(first, last, step) * bucket, minimum, maximum
@@ -1,6 +1,7 @@
 import os
+import numpy as np
 from PyQt6.QtWidgets import QApplication, QMessageBox, QFileDialog
-from PyQt6.QtCore import Qt, QItemSelectionModel, QTimer
+from PyQt6.QtCore import Qt, QTimer
 
 
 class Maps_Utility:
@@ -30,17 +31,10 @@ class Maps_Utility:
         if not text_addons_.copy_values(True):
             return
 
-        selection_model = self.ui.table_view.selectionModel()  # get all selected items
-        selected_indexes = selection_model.selectedIndexes()  # all selected items
+        starts, stops = text_addons_.selection_intervals() # one run, the selection is consecutive
 
-        first_row = selected_indexes[0].row()
-        first_col = selected_indexes[0].column()
-
-        last_row = selected_indexes[-1].row()
-        last_col = selected_indexes[-1].column()
-
-        self.start_index = (first_row * self.ui.columns) + first_col - self.ui.shift_count
-        self.end_index = (last_row * self.ui.columns) + last_col - self.ui.shift_count
+        self.start_index = int(starts[0]) - self.ui.shift_count
+        self.end_index = int(stops[0]) - 1 - self.ui.shift_count
 
         clipboard_text = clipboard.text() # get text from clipboard
 
@@ -113,8 +107,7 @@ class Maps_Utility:
         self.ui.map_list_counter += 1
 
         if self.ui.potential_map_added:
-            self.ui.potential_maps_start.pop(self.ui.potential_map_index)
-            self.ui.potential_maps_end.pop(self.ui.potential_map_index)
+            self.ui.potential_maps_manager.remove_map(self.ui.potential_map_index)
 
     def write_file_mp(self):
         with open(self.file_path, 'a') as file:
@@ -140,12 +133,8 @@ class Maps_Utility:
         self.timer.timeout.connect(self.auto_enable_context_menu)
         self.timer.start()
 
-        selection_model = self.ui.table_view.selectionModel()
-        selection_indexes = selection_model.selectedIndexes()
-
-        if len(selection_indexes) == 1:
-            row = selection_indexes[0].row()
-            col = selection_indexes[0].column()
+        if self.ui.text_addons.selected_count() == 1:
+            row, col = self.ui.text_addons.first_selected()
 
             index = self.ui.model.index(row, col)
 
@@ -208,8 +197,6 @@ class Maps_Utility:
                 start_index_unpacked = int(content[item_index + 1])
                 end_index_unpacked = int(content[item_index + 2]) + 1
 
-                start_index_current = start_index_unpacked + self.ui.shift_count
-                end_index_current = end_index_unpacked + self.ui.shift_count
                 size = content[item_index + 3].strip()
             except ValueError:
                 QMessageBox.warning(self.ui, "Warning",
@@ -219,33 +206,24 @@ class Maps_Utility:
 
             self.col, self.row = map(int, size.split('x'))
 
-            self.map_data = self.ui.unpacked[start_index_unpacked:end_index_unpacked]
+            unpacked = self.ui.image.original
+            current_values = self.ui.image.current
+
+            self.map_data = unpacked[start_index_unpacked:end_index_unpacked]
             self.ui.mode3d.paste_data(True, self.map_data, self.row, self.col, False, item)
 
             if start_index_unpacked >= self.col + self.row:
-                self.x_axis = self.ui.unpacked[start_index_unpacked - self.col:start_index_unpacked]
-                self.y_axis = self.ui.unpacked[start_index_unpacked - (self.col + self.row):start_index_unpacked - self.col]
+                self.x_axis = unpacked[start_index_unpacked - self.col:start_index_unpacked]
+                self.y_axis = unpacked[start_index_unpacked - (self.col + self.row):start_index_unpacked - self.col]
                 self.ui.mode3d.paste_x_data(True, self.x_axis, False)
                 self.ui.mode3d.paste_y_data(True, self.y_axis, False)
 
-            values = self.ui.model.get_all_data()
-
-            self.ui.current_values = []
-
-            for i in range(self.ui.shift_count):
-                self.ui.current_values.append(None)
-
-            for row in values:
-                for col in row:
-                    if col is not None:
-                        self.ui.current_values.append(col)
-
-            self.map_data = self.ui.current_values[start_index_current:end_index_current]
+            self.map_data = current_values[start_index_unpacked:end_index_unpacked]
             self.ui.mode3d.paste_data(True, self.map_data, self.row, self.col, True, item)
 
-            if start_index_current >= self.col + self.row:
-                self.x_axis = self.ui.current_values[start_index_current - self.col:start_index_current]
-                self.y_axis = self.ui.current_values[start_index_current - (self.col + self.row):start_index_current - self.col]
+            if start_index_unpacked >= self.col + self.row:
+                self.x_axis = current_values[start_index_unpacked - self.col:start_index_unpacked]
+                self.y_axis = current_values[start_index_unpacked - (self.col + self.row):start_index_unpacked - self.col]
                 self.ui.mode3d.paste_x_data(True, self.x_axis, True)
                 self.ui.mode3d.paste_y_data(True, self.y_axis, True)
 
@@ -256,9 +234,10 @@ class Maps_Utility:
     def highlight_2d_map(self, start_index, end_index):
         self.ui.start_index_maps.append(start_index)
         self.ui.end_index_maps.append(end_index)
+        self.ui.model.add_region(start_index, end_index)
 
         self.ui.sync_2d_scroll = True
-        self.ui.mode2d.draw_canvas(self.ui)
+        self.ui.redraw.request("2d")
 
     def write_map(self):
         if not os.path.exists(self.file_path) or self.ui.map_list_counter == 0:
@@ -284,18 +263,6 @@ class Maps_Utility:
                                             "\nPlease restart the application!")
                         return
 
-        values = self.ui.model.get_all_data() # get current values
-
-        self.ui.current_values = []
-
-        for i in range(self.ui.shift_count):
-            self.ui.current_values.append(None)
-
-        for row in values:
-            for col in row:
-                if col is not None:
-                    self.ui.current_values.append(col)
-
         for i in range(self.ui.num_rows_3d): # get y axis values
             value_entry = float(self.ui.box_layout.verticalHeaderItem(i).text())
             value_before = round(self.ui.y_values[i])
@@ -336,40 +303,19 @@ class Maps_Utility:
             content = file.read().split('\n')
             index = self.last_map_index * 10
             try:
-                start = int(content[index + 1]) + self.ui.shift_count
-                end = int(content[index + 2]) + self.ui.shift_count
+                start = int(content[index + 1])
+                end = int(content[index + 2])
             except ValueError:
                 QMessageBox.warning(self.ui, "Warning",
                                     "There is a problem with the mappack file. It appears to have been modified by an user."
                                     "\nPlease restart the application!")
                 return
 
-        x = 0
-
-        for i in range(start - (self.ui.num_rows_3d + self.ui.num_columns_3d), end + 1):
-            self.ui.current_values[i] = map_values[x]
-            x += 1
-
-        rows = [self.ui.current_values[i:i + self.ui.columns] for i in
-                range(0, len(self.ui.current_values) - self.ui.columns, self.ui.columns)]  # get values by rows
-
-        remaining_elements = len(self.ui.current_values) % self.ui.columns  # last row offset
-
-        if remaining_elements:
-            last_row = list(self.ui.current_values[-remaining_elements:]) + [None] * (
-                    self.ui.columns - remaining_elements)  # last row values
-            rows.append(last_row)
-
-        self.ui.model.set_data(rows)
-        self.ui.model.layoutChanged.emit()
-
-        from text_view import TextView
-        text_view = TextView(self.ui)
+        map_start = start - (self.ui.num_rows_3d + self.ui.num_columns_3d) # axis values are stored in front of the map
 
-        text_view.set_labels_y_axis()
-        text_view.set_column_width()
+        self.ui.model.write(slice(map_start, end + 1), np.clip(map_values, 0, 65535))
 
-        self.ui.mode2d.draw_canvas(self.ui)
+        self.ui.redraw.request("2d")
 
     def remove_item(self):
         selected_index = self.ui.map_list.currentRow()
@@ -413,8 +359,9 @@ class Maps_Utility:
 
         self.ui.start_index_maps.remove(start_index)
         self.ui.end_index_maps.remove(end_index)
+        self.ui.model.update_regions()
 
-        self.ui.mode2d.draw_canvas(self.ui)
+        self.ui.redraw.request("2d")
 
     def show_map_in_text(self):
         selected_index = self.ui.map_list.currentRow()
@@ -441,6 +388,24 @@ class Maps_Utility:
 
         self.ui.tabs.setCurrentIndex(0)
 
+    def show_potential_map(self, item):
+        pruned = item.data(Qt.ItemDataRole.UserRole + 1) # start and end of a pruned map
+        if pruned is not None:
+            start, end = pruned
+            end = min(end, len(self.ui.image) - 1) # pruned maps can run past the image
+        else:
+            index = self.ui.potential_maps.index(item.data(Qt.ItemDataRole.UserRole))
+            if index is None:
+                return
+
+            start = int(self.ui.potential_maps.starts[index])
+            end = int(self.ui.potential_maps.ends[index])
+
+        self.ui.mode2d.highlight_text(start, True)
+        self.ui.text_addons.select_interval(start + self.ui.shift_count, end + self.ui.shift_count)
+
+        self.ui.tabs.setCurrentIndex(0)
+
     def import_map(self):
         if not self.ui.file_path:
             QMessageBox.warning(self.ui, "Warning", "No file is currently open. Please open a file first.")
@@ -463,6 +428,7 @@ class Maps_Utility:
                             self.ui.map_list.clear()
                             self.ui.start_index_maps.clear()
                             self.ui.end_index_maps.clear()
+                            self.ui.model.update_regions()
                             self.ui.maps_names = []
                             self.first_run = False
                         for i in range(len(content) // 10):
@@ -483,6 +449,7 @@ class Maps_Utility:
 
                 self.ui.start_index_maps.clear()
                 self.ui.end_index_maps.clear()
+                self.ui.model.update_regions()
 
     def export_map(self):
         if not self.ui.file_path:
@@ -513,71 +480,42 @@ class Maps_Utility:
             self.ui.signed_values = True
 
     def add_potential_map(self):
-        selection_model = self.ui.table_view.selectionModel()
-        selection_indexes = selection_model.selectedIndexes()
-
-        if len(selection_indexes) == 1:
-            row = selection_indexes[0].row()
-            col = selection_indexes[0].column()
-
-            index_value = (row * self.ui.columns) + col
-
-            self.ui.potential_map_index = None
+        if self.ui.text_addons.selected_count() == 1:
+            row, col = self.ui.text_addons.first_selected()
 
-            selected_indexes = []
-            for i in range(len(self.ui.potential_maps_start)):
-                start = self.ui.potential_maps_start[i]
-                end = self.ui.potential_maps_end[i]
+            index_value = (row * self.ui.columns) + col - self.ui.shift_count
 
-                if start <= index_value <= end:
-                    for j in range(start, end + 1):
-                        selected_row = j // self.ui.columns
-                        selected_col = j % self.ui.columns
-                        selected_indexes.append(self.ui.table_view.model().index(selected_row, selected_col))
-                    self.ui.potential_map_index = i
-                    break
+            self.ui.potential_map_index = self.ui.potential_maps.find(index_value)
 
             if self.ui.potential_map_index is None:
                 QMessageBox.warning(self.ui, "Warning", "There is no potential map on the selected cell!")
                 return
 
-            if selected_indexes:
-                for index in selected_indexes:
-                    selection_model.select(index, QItemSelectionModel.SelectionFlag.Select)
+            start = int(self.ui.potential_maps.starts[self.ui.potential_map_index]) + self.ui.shift_count
+            end = int(self.ui.potential_maps.ends[self.ui.potential_map_index]) + self.ui.shift_count
 
-                self.add_map()
-
-    def remove_potential_map(self):
-        selection_model = self.ui.table_view.selectionModel()
-        selection_indexes = selection_model.selectedIndexes()
+            self.ui.text_addons.select_interval(start, end)
 
-        if len(selection_indexes) == 1:
-            row = selection_indexes[0].row()
-            col = selection_indexes[0].column()
+            self.add_map()
 
-            index_value = (row * self.ui.columns) + col
-
-            potential_map_index = None
+    def remove_potential_map(self):
+        if self.ui.text_addons.selected_count() == 1:
+            row, col = self.ui.text_addons.first_selected()
 
-            for i in range(len(self.ui.potential_maps_start)):
-                start = self.ui.potential_maps_start[i]
-                end = self.ui.potential_maps_end[i]
+            index_value = (row * self.ui.columns) + col - self.ui.shift_count
 
-                if start <= index_value <= end:
-                    potential_map_index = i
-                    break
+            potential_map_index = self.ui.potential_maps.find(index_value)
 
             if potential_map_index is None:
                 QMessageBox.warning(self.ui, "Warning", "There is no potential map on the selected cell!")
                 return
 
-            self.ui.potential_maps_start.pop(potential_map_index)
-            self.ui.potential_maps_end.pop(potential_map_index)
+            self.ui.potential_maps_manager.remove_map(potential_map_index)
 
             QMessageBox.information(self.ui, "Info", "Potential map has been successfully removed!")
 
             self.ui.sync_2d_scroll = True
-            self.ui.mode2d.draw_canvas(self.ui)
+            self.ui.redraw.request("2d")
 
     def start_potential_map_search(self, restart):
         if restart:
@@ -596,13 +534,11 @@ class Maps_Utility:
                 QMessageBox.information(self.ui, "Info", "Potential map search canceled.")
                 return
 
-        from potential_maps.potential_maps import Potential_maps_manager
-        self.potential_maps_manager = Potential_maps_manager(self.ui)
-        self.potential_maps_manager.find_potential_maps()
+        self.ui.potential_maps_manager.start_search(False)
 
         if restart:
             self.ui.sync_2d_scroll = True
-            self.ui.mode2d.draw_canvas(self.ui)
+            self.ui.redraw.request("2d")
 
     def sort_maps(self):
         if not self.file_path and self.ui.map_list_counter <= 1:
@@ -628,6 +564,7 @@ class Maps_Utility:
         self.ui.map_list.clear()
         self.ui.start_index_maps.clear()
         self.ui.end_index_maps.clear()
+        self.ui.model.update_regions()
         self.ui.maps_names = []
         self.first_run = False
 
@@ -1,50 +1,186 @@
-def find_potential_maps(unpacked):
-    cdef int i = 0
-    cdef int y_axis, x_axis, j, whole_size
-    cdef bint found_y_axis, found_x_axis
-    cdef list potential_maps_start = []
-    cdef list potential_maps_end = []
-
-    while i < len(unpacked) - 90:
-        y_axis = 0
-        x_axis = 0
-        found_y_axis = False
-        found_x_axis = False
-
-        # Search for the Y-axis
-        for j in range(17):
-            if unpacked[i + j] >= unpacked[i + j + 1]:
-                if j < 7:
-                    found_y_axis = False
-                    break
-                else:
-                    found_y_axis = True
-                    y_axis = j + 1
-                    break
-            elif j == 16:
-                found_y_axis = False
-
-        # If Y-axis is found, search for the X-axis
-        if found_y_axis:
-            for j in range(17):
-                if unpacked[i + j + y_axis] >= unpacked[i + j + 1 + y_axis]:
-                    if j < 7:
-                        found_x_axis = False
-                        break
-                    else:
-                        found_x_axis = True
-                        x_axis = j + 1
-                        break
-                elif j == 16:
-                    found_x_axis = False
+# cython: language_level=3, boundscheck=False, wraparound=False
+import numpy as np
+
+VERSION = 1 # raise whenever the search could find different maps, cached results are searched again
+MIN_MAP_SIZE = 80 # smallest map, two axes of 8 values and 8 * 8 map values
+
+
+cdef int axis_length(const unsigned short[:] unpacked, Py_ssize_t start) noexcept nogil:
+    # number of values in a strictly increasing axis of 8 to 17 values at start, 0 when there is none
+    cdef int j
+    for j in range(17):
+        if unpacked[start + j] >= unpacked[start + j + 1]:
+            return j + 1 if j >= 7 else 0
+    return 0
+
+
+cdef Py_ssize_t scan(const unsigned short[:] unpacked, Py_ssize_t i, Py_ssize_t stop, Py_ssize_t[:] origins,
+                     Py_ssize_t[:] starts, Py_ssize_t[:] ends, Py_ssize_t *found) noexcept nogil:
+    # walks the search positions from i up to stop, returns the first position at or behind stop
+    cdef Py_ssize_t limit = min(stop, unpacked.shape[0] - 90)
+    cdef int y_axis, x_axis, whole_size
+
+    while i < limit:
+        # Search for the Y-axis, then for the X-axis right behind it
+        y_axis = axis_length(unpacked, i)
+        x_axis = axis_length(unpacked, i + y_axis) if y_axis else 0
 
         # If both X and Y axes are found and the conditions are met
-        if found_x_axis and found_y_axis and not (unpacked[i] != 0 and unpacked[i] < 500):
+        if x_axis and not (unpacked[i] != 0 and unpacked[i] < 500):
             whole_size = x_axis + y_axis + (x_axis * y_axis)
-            potential_maps_start.append(i + x_axis + y_axis)
-            potential_maps_end.append(i + whole_size - 1)
+            origins[found[0]] = i
+            starts[found[0]] = i + x_axis + y_axis
+            ends[found[0]] = i + whole_size - 1
+            found[0] += 1
             i += whole_size
         else:
             i += 1
 
-    return potential_maps_start, potential_maps_end
\ No newline at end of file
+    return max(i, stop)
+
+
+def scan_range(values, Py_ssize_t start, Py_ssize_t stop):
+    # maps found by a walk from start to stop as arrays of first axis position, map start and map end,
+    # and the position the walk continues at, the GIL is released while searching
+    # axes found close to stop are read from behind it, chunks share the whole image instead of overlapping copies
+    cdef const unsigned short[:] unpacked = values
+    cdef Py_ssize_t found = 0
+    cdef Py_ssize_t size = max(stop - start, 0) // MIN_MAP_SIZE + 1
+    cdef Py_ssize_t position
+
+    origins = np.empty(size, dtype=np.intp)
+    starts = np.empty(size, dtype=np.intp)
+    ends = np.empty(size, dtype=np.intp)
+    cdef Py_ssize_t[:] origins_view = origins
+    cdef Py_ssize_t[:] starts_view = starts
+    cdef Py_ssize_t[:] ends_view = ends
+
+    with nogil:
+        position = scan(unpacked, start, stop, origins_view, starts_view, ends_view, &found)
+
+    return origins[:found], starts[:found], ends[:found], position
+
+
+cdef int find_axes(const unsigned short[:] unpacked, Py_ssize_t start, Py_ssize_t size) noexcept nogil:
+    # Y axis length of a found map, 0 when the axes in front of it do not match its size anymore
+    # the walk does not keep it, it is the factor of the map size that the axes at the map agree with
+    cdef int y_axis, x_axis
+    cdef Py_ssize_t origin
+    for y_axis in range(8, 18):
+        x_axis = size // y_axis
+        if size % y_axis or x_axis < 8 or x_axis > 17:
+            continue
+        origin = start - x_axis - y_axis
+        if origin < 0 or origin + 35 > unpacked.shape[0]:
+            continue
+        if axis_length(unpacked, origin) == y_axis and axis_length(unpacked, origin + y_axis) == x_axis:
+            return y_axis
+    return 0
+
+
+def map_features(values, starts, ends):
+    # one pass over the axes and values of found maps, the scoring stages only combine these numbers
+    # columns are Y and X axis length, smallest and largest Y and X axis step, sum of the absolute second
+    # differences along the map rows, lowest and highest map value and the count of fill values
+    cdef const unsigned short[:] unpacked = np.ascontiguousarray(values, dtype=np.uint16)
+    cdef const Py_ssize_t[:] starts_view = np.ascontiguousarray(starts, dtype=np.intp)
+    cdef const Py_ssize_t[:] ends_view = np.ascontiguousarray(ends, dtype=np.intp)
+    cdef Py_ssize_t k, j, row, position, start, size
+    cdef long long step, value, previous, before, lowest, highest, second, fill
+    cdef long long smallest, largest
+    cdef int y_axis, x_axis, axis, first, length
+
+    features = np.zeros((starts_view.shape[0], 10), dtype=np.int64)
+    cdef long long[:, :] view = features
+
+    with nogil:
+        for k in range(starts_view.shape[0]):
+            start = starts_view[k]
+            size = ends_view[k] - start + 1
+            if start < 0 or size <= 0 or start + size > unpacked.shape[0]: # the walk can end maps behind the image
+                continue
+            y_axis = find_axes(unpacked, start, size)
+            if not y_axis:
+                continue
+            x_axis = <int>(size // y_axis)
+            view[k, 0] = y_axis
+            view[k, 1] = x_axis
+
+            for axis in range(2):
+                first = 0 if axis == 0 else y_axis
+                length = y_axis if axis == 0 else x_axis
+                position = start - x_axis - y_axis + first
+                smallest = 65536
+                largest = 0
+                for j in range(length - 1):
+                    step = <long long>unpacked[position + j + 1] - unpacked[position + j]
+                    smallest = min(smallest, step)
+                    largest = max(largest, step)
+                view[k, 2 + 2 * axis] = smallest
+                view[k, 3 + 2 * axis] = largest
+
+            lowest = 65535
+            highest = 0
+            second = 0
+            fill = 0
+            for row in range(y_axis):
+                position = start + row * x_axis
+                previous = before = 0
+                for j in range(x_axis):
+                    value = unpacked[position + j]
+                    lowest = min(lowest, value)
+                    highest = max(highest, value)
+                    if value == 0 or value == 0xFFFF:
+                        fill += 1
+                    if j >= 2:
+                        second += abs(value - 2 * previous + before)
+                    before = previous
+                    previous = value
+            view[k, 6] = second
+            view[k, 7] = lowest
+            view[k, 8] = highest
+            view[k, 9] = fill
+
+    return features
+
+
+def find_potential_maps(values):
+    # values are read through a typed memoryview, byte swapped views are converted to native order once
+    values = np.ascontiguousarray(values, dtype=np.uint16)
+    origins, starts, ends, position = scan_range(values, 0, len(values))
+
+    return starts.tolist(), ends.tolist()
+
+
+def search_chunks(values, map_chunks=map, Py_ssize_t chunk_size=1 << 20):
+    # maps of the sequential walk chunk by chunk, as map start and end lists and the values searched so far
+    # chunks are searched by map_chunks, executor.map searches them at the same time and they are joined in order
+    values = np.ascontiguousarray(values, dtype=np.uint16)
+    bounds = list(range(0, len(values), chunk_size)) + [len(values)]
+    chunks = map_chunks(lambda k: scan_range(values, bounds[k], bounds[k + 1]), range(len(bounds) - 1))
+
+    position = 0 # where the sequential walk would continue
+    for k, (origins, starts, ends, chunk_position) in enumerate(chunks):
+        if position >= bounds[k + 1]: # skipped over by a map of an earlier chunk
+            yield [], [], bounds[k + 1]
+            continue
+
+        # the chunk walk started at the chunk border, its maps are valid from the first position both
+        # walks visit, a position inside a chunk map is only visited by the sequential walk
+        first = np.searchsorted(origins, position)
+        if first > 0 and ends[first - 1] >= position:
+            origins, starts, ends, chunk_position = scan_range(values, position, bounds[k + 1])
+            first = 0
+
+        position = chunk_position
+        yield starts[first:].tolist(), ends[first:].tolist(), bounds[k + 1]
+
+
+def find_potential_maps_parallel(values, executor, Py_ssize_t chunk_size=1 << 20):
+    # same result as find_potential_maps, chunks are searched at the same time
+    maps_start, maps_end = [], []
+    for starts, ends, searched in search_chunks(values, executor.map, chunk_size):
+        maps_start.extend(starts)
+        maps_end.extend(ends)
+
+    return maps_start, maps_end
@@ -0,0 +1,64 @@
+import numpy as np
+from potential_maps.search_module import find_maps
+
+
+class MapFeatures:
+    # maps found by the search walk and the numbers the scoring stages read, all maps are measured in one pass
+    # the stages only rank the maps of the walk, they do not find maps of other layouts
+    def __init__(self, values, starts, ends):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+
+        # two axes of up to 17 values are read in front of the first map
+        low = max(int(self.starts[0]) - 34, 0) if len(self.starts) else 0
+        high = int(self.ends[-1]) + 1 if len(self.ends) else 0
+        features = find_maps.map_features(values[low:high], self.starts - low, self.ends - low).T
+
+        self.y_axes, self.x_axes = features[0], features[1]
+        self.y_steps = features[2], features[3] # smallest and largest step
+        self.x_steps = features[4], features[5]
+        self.second_differences = features[6] # sum along the map rows
+        self.lowest, self.highest = features[7], features[8]
+        self.fill = features[9] # values that are erased or padded flash
+
+        self.valid = self.y_axes > 0 # axes still match the map size
+        self.sizes = self.ends - self.starts + 1
+
+    def __len__(self):
+        return len(self.starts)
+
+
+def axis_plausibility(features):
+    # evenly spaced axes score 1, the score falls with the spread of the axis steps
+    scores = np.ones(len(features))
+    for smallest, largest in (features.y_steps, features.x_steps):
+        scores *= 1 / (1 + np.log(np.maximum(largest, 1) / np.maximum(smallest, 1)) / 4)
+    return np.sqrt(scores)
+
+
+def smoothness(features):
+    # mean second difference along the map rows relative to the value span, calibration maps are smooth
+    counts = features.y_axes * np.maximum(features.x_axes - 2, 0)
+    roughness = features.second_differences / np.maximum(counts, 1)
+    span = features.highest - features.lowest
+    return 1 / (1 + 4 * roughness / np.maximum(span, 1))
+
+
+def value_range(features):
+    # maps hold different values, mostly other than fill values
+    span = features.highest - features.lowest
+    return np.where(span > 0, 1 - features.fill / features.sizes, 0)
+
+
+STAGES = [(axis_plausibility, 1.0), (smoothness, 1.0), (value_range, 0.5)] # scoring stage and its weight
+PRUNE_SCORE = 0 # found maps scoring this or less are pruned, maps without matching axes or past the image score 0
+
+
+def score_maps(values, starts, ends, stages=STAGES):
+    # confidence of every found map from 0 to 1, weighted mean of the scoring stages
+    features = MapFeatures(values, starts, ends)
+    if not len(features):
+        return np.zeros(0)
+
+    total = sum(weight * stage(features) for stage, weight in stages)
+    return np.where(features.valid, total / sum(weight for stage, weight in stages), 0)
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import numpy as np
+
+MAX_BYTES = 64 * 1024 * 1024 # least recently used results are removed above this size
+
+
+class MapsCache:
+    def __init__(self, directory=None, max_bytes=MAX_BYTES):
+        if directory is None:
+            from PyQt6.QtCore import QStandardPaths
+            cache_location = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+            directory = os.path.join(cache_location, "LinOLS", "potential_maps")
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(image, version):
+        # content of the original file, the byte order the values were searched in and the search version
+        from image_buffer.image_patch import image_hash
+
+        byte_order = "lo_hi" if image.low_high else "hi_lo"
+        return f"{image_hash(image.original_bytes).hex()}-{byte_order}-v{version}"
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".npy")
+
+    def get(self, key): # maps start and end lists, or None when the image was not searched before
+        path = self.path(key)
+        try:
+            maps = np.load(path, allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+
+        if maps.ndim != 2 or len(maps) != 2:
+            return None
+
+        try:
+            os.utime(path) # most recently used
+        except OSError:
+            pass
+
+        return maps[0].tolist(), maps[1].tolist()
+
+    def put(self, key, maps_start, maps_end):
+        # failing to write only means searching again next time
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".linols_", suffix=".tmp", dir=self.directory)
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.save(file, np.array([maps_start, maps_end], dtype=np.int64).reshape(2, -1))
+            os.replace(temp_path, self.path(key))
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        self.evict()
+
+    def evict(self):
+        try:
+            entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                       for entry in os.scandir(self.directory) if entry.name.endswith(".npy")]
+        except OSError:
+            return
+
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# find_maps is compiled next to this file (setup.py build_ext --inplace), its directory is put on the path once
+# when the first search module is imported, the bundled app finds it at the top level without it
+directory = os.path.dirname(os.path.abspath(__file__))
+if directory not in sys.path:
+    sys.path.append(directory)
+
+import find_maps
@@ -1,4 +1,3 @@
-import struct
 import os
 from PyQt6.QtWidgets import QMessageBox, QInputDialog, QFileDialog
 
@@ -6,82 +5,101 @@ from PyQt6.QtWidgets import QMessageBox, QInputDialog, QFileDialog
 class TextView:
     def __init__(self, ui):
         self.ui = ui
+        self.loader = None # background loader of the file being opened
 
     def open_file(self):
         file_path, selected_filter = QFileDialog.getOpenFileName(self.ui, "Open File")
-        if file_path:
-            self.ui.file_path = file_path
-        else:
+        if not file_path:
             return
 
-        if self.ui.file_path:
-            with open(self.ui.file_path, 'rb') as file:
-                content = file.read()
-                if len(content) % 2 != 0:
-                    QMessageBox.warning(self.ui, "Error", "Please open a valid file!")
-                    return
-                if self.ui.low_high:
-                    self.ui.unpacked = struct.unpack('<' + 'H' * (len(content) // 2), content)
-                    self.ui.btn_lo_hi.setEnabled(False)
-                    self.ui.btn_hi_lo.setEnabled(True)
-                else:
-                    self.ui.unpacked = struct.unpack('>' + 'H' * (len(content) // 2), content)
-                    self.ui.btn_lo_hi.setEnabled(True)
-                    self.ui.btn_hi_lo.setEnabled(False)
+        self.cancel_loading()
+
+        from image_buffer.image_loader import ImageLoader
+        loader = ImageLoader(file_path, self.ui.low_high, self.ui)
+        self.loader = loader
+
+        # signals of a replaced or canceled loader are ignored
+        loader.progress.connect(lambda percent, text: self.on_load_progress(loader, percent, text))
+        loader.loaded.connect(lambda image: self.on_image_loaded(loader, file_path, image))
+        loader.failed.connect(lambda error: self.on_load_failed(loader, error))
+        loader.finished.connect(lambda: self.on_load_finished(loader))
 
-                self.ui.current_values = self.ui.unpacked
+        loader.start()
+
+    def cancel_loading(self, wait=False):
+        self.ui.potential_maps_manager.cancel_search(wait)
+
+        loader = self.loader
+        if loader is None:
+            return
 
-                self.ui.columns = 20
-                self.ui.shift_count = 0
+        self.loader = None
+        loader.requestInterruption()
+        if wait:
+            loader.wait()
 
-                self.ui.entry_col.setText(f"Columns: {self.ui.columns:02}")
-                self.ui.entry_shift.setText(f"Shift: {self.ui.shift_count:02}")
+        self.ui.set_load_progress(None)
 
-                self.rows = [self.ui.unpacked[i:i + self.ui.columns] for i in
-                             range(0, len(self.ui.unpacked) - self.ui.columns, self.ui.columns)] # get values by rows
+    def on_load_progress(self, loader, percent, text):
+        if loader is self.loader:
+            self.ui.set_load_progress(percent, text)
 
-                remaining_elements = len(self.ui.unpacked) % self.ui.columns # last row offset
+    def on_load_failed(self, loader, error):
+        if loader is self.loader:
+            QMessageBox.warning(self.ui, "Error", f"Please open a valid file!\n{error}")
 
-                if remaining_elements:
-                    last_row = list(self.ui.unpacked[-remaining_elements:]) + [None] * (
-                                self.ui.columns - remaining_elements) # last row values
-                    self.rows.append(last_row)
+    def on_load_finished(self, loader):
+        if loader is self.loader:
+            self.loader = None
+            if self.ui.potential_maps_manager.search_thread is None: # shows the progress of the map search
+                self.ui.set_load_progress(None)
 
-                from ui import CustomTableView
-                CustomTableView(self.ui)
+    def on_image_loaded(self, loader, file_path, image):
+        if loader is not self.loader:
+            return
+
+        self.ui.image = image
+        self.ui.file_path = file_path
+
+        if self.ui.low_high:
+            self.ui.btn_lo_hi.setEnabled(False)
+            self.ui.btn_hi_lo.setEnabled(True)
+        else:
+            self.ui.btn_lo_hi.setEnabled(True)
+            self.ui.btn_hi_lo.setEnabled(False)
 
-                self.ui.model.set_data(self.rows) # set values
-                self.ui.model.layoutChanged.emit() # update table view
+        self.ui.columns = 20
+        self.ui.shift_count = 0
 
-                self.set_column_width()
-                self.set_labels_y_axis()
+        self.ui.entry_col.setText(f"Columns: {self.ui.columns:02}")
+        self.ui.entry_shift.setText(f"Shift: {self.ui.shift_count:02}")
 
-                # reset variables
-                self.ui.differences = []
-                self.ui.ori_values = []
-                self.ui.map_list.clear()
-                self.ui.map_list_counter = 0
-                self.ui.start_index_maps = []
-                self.ui.end_index_maps = []
-                self.ui.maps_names = []
-                self.ui.maps.last_map_index = 0
+        from ui import CustomTableView
+        CustomTableView(self.ui)
 
-                self.ui.maps.start_potential_map_search(False)
+        self.refresh_table() # cells are read from the new buffer
+        self.ui.overview_2d.view = None # whole image
+        self.ui.view_size_2d = 0 # one frame
 
-                from Module_2D import Mode2D
-                self.mode2d = Mode2D(self)
-                self.mode2d.draw_canvas(self.ui)
+        # reset variables
+        self.ui.differences = []
+        self.ui.ori_values = []
+        self.ui.map_list.clear()
+        self.ui.map_list_counter = 0
+        self.ui.start_index_maps = []
+        self.ui.end_index_maps = []
+        self.ui.maps_names = []
+        self.ui.maps.last_map_index = 0
+        self.ui.potential_maps_manager.suppressed = set() # maps removed in the closed file
+        self.ui.potential_maps_manager.start_search(True) # maps are filled in while the user works
 
-                self.ui.mode3d.set_default()
+        self.ui.redraw.request("2d")
 
-    def set_labels_y_axis(self):
-        labels = []
-        for i in range(self.ui.model.rowCount()):
-            value = (i * self.ui.model.columnCount()) * 2
-            value = f"{value:06X}"
-            labels.append(value)
+        self.ui.mode3d.set_default()
 
-        self.ui.model.setVerticalHeaderLabels(labels) # set the vertical header
+    def refresh_table(self): # after the columns, shift or file changed
+        self.ui.model.refresh_layout()
+        self.set_column_width()
 
     def set_column_width(self, width=60): # changes size of every column
         for col in range(self.ui.columns):
@@ -106,27 +124,6 @@ class TextView:
             self.change_display_mode(mode)
 
     def change_display_mode(self, mode):
-        unpacked_byte_change = []
-
-        for value in self.ui.unpacked:
-            low = value & 0xFF
-            high = (value >> 8) & 0xFF
-            combined = (low * 256) + high
-            unpacked_byte_change.append(combined)
-
-        current_values_byte_change = []
-        for value in self.ui.current_values:
-            if value is None:
-                current_values_byte_change.append(None)
-                continue
-            low = value & 0xFF
-            high = (value >> 8) & 0xFF
-            combined = (low * 256) + high
-            current_values_byte_change.append(combined)
-
-        self.ui.unpacked = unpacked_byte_change
-        self.ui.current_values = current_values_byte_change
-
         if mode == "low_high":
             self.ui.low_high = True
             self.ui.btn_lo_hi.setEnabled(False)
@@ -137,34 +134,20 @@ class TextView:
             self.ui.btn_lo_hi.setEnabled(True)
             self.ui.btn_hi_lo.setEnabled(False)
 
-        rows = [self.ui.current_values[i:i + self.ui.columns] for i in
-                range(0, len(self.ui.current_values) - self.ui.columns, self.ui.columns)]  # get values by rows
+        self.ui.image.low_high = self.ui.low_high # only the view over the bytes changes
 
-        remaining_elements = len(self.ui.current_values) % self.ui.columns  # last row offset
+        # the words are other values now, so are the maps, rescans only work on maps of the same byte order
+        self.ui.potential_maps_manager.suppressed = set()
+        self.ui.potential_maps_manager.start_search(False)
 
-        if remaining_elements:
-            last_row = list(self.ui.current_values[-remaining_elements:]) + [None] * (
-                    self.ui.columns - remaining_elements)  # last row values
-            rows.append(last_row)
-
-        self.ui.model.set_data(rows)
-        self.ui.model.layoutChanged.emit()
-
-        self.set_labels_y_axis()
-        self.set_column_width()
+        self.ui.model.refresh_values()
+        self.ui.redraw.request("2d")
 
     def save_file(self):
         if not self.ui.file_path:
             QMessageBox.warning(self.ui, "Warning", "No file is currently open. Please open a file first.")
             return
 
-        values = self.ui.model.get_all_data()
-        current_values = []
-        for row in values:
-            for col in row:
-                if col is not None:
-                    current_values.append(col)
-
         file_name = self.ui.last_file_name
 
         last_file_dir = ""
@@ -226,19 +209,68 @@ class TextView:
                         self.ui.last_file_name = last_file_dir
                     return
 
-            if self.ui.low_high:
-                content_to_write = b''.join(struct.pack('<H', int(value)) for value in current_values)
-            else:
-                content_to_write = b''.join(struct.pack('>H', int(value)) for value in current_values)
-
             if file_path:
-                with open(file_path, 'wb') as file:
-                    self.ui.last_file_name = file_path
-                    file.write(content_to_write)
+                self.ui.image.save(file_path) # working bytes already use the file byte order
+                self.ui.last_file_name = file_path
             else:
-                with open(self.ui.last_file_name, 'wb') as file:
-                    file.write(content_to_write)
+                self.ui.image.save(self.ui.last_file_name)
 
             QMessageBox.information(self.ui, "Success", f"File saved successfully at {self.ui.last_file_name}.")
         except Exception as e:
-            QMessageBox.warning(self.ui, "Error", f"Error saving file: {e}")
\ No newline at end of file
+            QMessageBox.warning(self.ui, "Error", f"Error saving file: {e}")
+
+    def export_patch(self):
+        if not self.ui.file_path:
+            QMessageBox.warning(self.ui, "Warning", "No file is currently open. Please open a file first.")
+            return
+
+        from image_buffer.image_patch import ImagePatch
+        patch = ImagePatch.create(self.ui.image.original_bytes, self.ui.image.current_bytes)
+
+        if not len(patch):
+            QMessageBox.warning(self.ui, "Warning", "There are no changes to export!")
+            return
+
+        file_path, selected_filter = QFileDialog.getSaveFileName(self.ui, "Export Patch", "Patch.lpt", "Patch Files (*.lpt)")
+        if not file_path:
+            QMessageBox.warning(self.ui, "Warning", "No file was selected for saving!")
+            return
+
+        try:
+            patch.write(file_path)
+        except OSError as e:
+            QMessageBox.warning(self.ui, "Error", f"Error exporting patch: {e}")
+            return
+
+        QMessageBox.information(self.ui, "Success", f"Patch with {len(patch.starts)} ranges exported to {file_path}.")
+
+    def import_patch(self):
+        if not self.ui.file_path:
+            QMessageBox.warning(self.ui, "Warning", "No file is currently open. Please open a file first.")
+            return
+
+        file_path, selected_filter = QFileDialog.getOpenFileName(self.ui, "Import Patch", "", "Patch Files (*.lpt);;All Files (*)")
+        if not file_path:
+            return
+
+        from image_buffer.image_patch import ImagePatch
+        try:
+            patch = ImagePatch.read(file_path)
+        except (OSError, ValueError):
+            QMessageBox.warning(self.ui, "Warning", "Please open a valid patch file!")
+            return
+
+        if not patch.matches(self.ui.image.original_bytes):
+            # the base image differs, still allow it when every patched word holds the expected value
+            if not patch.old_words_match(self.ui.image.original_bytes):
+                QMessageBox.warning(self.ui, "Warning", "The patch does not match the opened file!")
+                return
+
+            response = QMessageBox.question(self.ui, "Import Patch", "The patch was created for a different file, "
+                                            "but all patched values match. Do you want to apply it?")
+            if response != QMessageBox.StandardButton.Yes:
+                return
+
+        self.ui.model.write(patch.indexes(), patch.values(self.ui.image.dtype())) # undoable like any other edit
+
+        self.ui.redraw.request("2d")
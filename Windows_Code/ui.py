@@ -1,6 +1,6 @@
 import time
 from PyQt6.QtWidgets import QMainWindow, QWidget, QTabWidget, QTableView, QHeaderView, QGridLayout, QPushButton, \
-    QLabel, QLineEdit, QSizePolicy, QSpacerItem, QTableWidget, QListWidget, QVBoxLayout, QMenu, QMessageBox
+    QLabel, QLineEdit, QSizePolicy, QSpacerItem, QTableWidget, QListWidget, QVBoxLayout, QMenu, QMessageBox, QProgressBar
 from PyQt6.QtGui import QAction, QGuiApplication, QKeySequence, QShortcut, QFont, QIcon
 from PyQt6.QtCore import Qt, QPoint
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
@@ -17,8 +17,11 @@ class LinOLS(QMainWindow):
         from Module_3D import Mode3D
         from maps import Maps_Utility
         from potential_maps.potential_maps import Potential_maps_manager
+        from potential_maps.map_intervals import MapIntervals
         from canva_3d.canva_3d_window import TkWindowManager
         from ui_components.Toolbar_Widget.toolbar import ToolbarWidget
+        from ui_components.Redraw_Scheduler.redraw_scheduler import RedrawScheduler
+        from image_buffer.image_buffer import ImageBuffer
 
         self.setWindowTitle("LinOLS")
 
@@ -51,14 +54,16 @@ class LinOLS(QMainWindow):
         self.tk_win_manager = TkWindowManager(self)
         self.toolbar_widget = ToolbarWidget(self)
 
+        self.redraw = RedrawScheduler(self) # every canvas update goes through here
+        self.redraw.add_view("2d", lambda: self.mode2d.draw_canvas(self), lambda: not self.disable_2d_canvas)
+
         '''General variables'''
         self.file_path = "" # file path of the loaded file
         self.last_file_name = ""  # last used file name for saving the file
         self.columns = 20 # num of columns
         self.num_rows = 55 # num of rows for 2d
-        self.unpacked = [] # all original numbers
+        self.image = ImageBuffer() # original and current values shared by all views
         self.low_high = True  # low_high or high_low
-        self.current_values = []  # current values in text and 2d view
 
         '''Text view variables'''
         self.return_text = False # used for returning to previous value
@@ -66,6 +71,7 @@ class LinOLS(QMainWindow):
 
         '''2d variables'''
         self.current_frame = 0 # current 2d frame
+        self.view_size_2d = 0 # values shown in 2d after zooming, 0 shows one frame
         self.percentage_num = 0 # percentage number in 2d
         self.display_sel = False # flag to control whether selection should be displayed in 2d
         self.sel_start = 0 # start of the selection
@@ -130,9 +136,7 @@ class LinOLS(QMainWindow):
         self.focused_3d_tab = False
 
         '''Potential maps variables'''
-        self.potential_maps_start = [] # all potential maps start indexes
-        self.potential_maps_end = [] # all potential maps end indexes
-        self.potential_maps_names = [] # all potential maps names
+        self.potential_maps = MapIntervals() # all potential maps in image positions
 
         self.potential_map_added = False # for checking if potential map has been added successfully
         self.potential_map_index = None
@@ -227,6 +231,9 @@ class LinOLS(QMainWindow):
         self.create_shortcut(self.tab3, "Ctrl+C")
         self.create_shortcut(self.tab3, "Ctrl+V")
 
+        self.create_shortcut(self.tab3, "Ctrl+Z")
+        self.create_shortcut(self.tab3, "Ctrl+Y")
+
         self.create_shortcut(self.tab3, "Ctrl+Shift+C")
         self.create_shortcut(self.tab3, "Ctrl+Shift+V")
 
@@ -269,9 +276,17 @@ class LinOLS(QMainWindow):
         elif key_sequence == "Ctrl+Z":
             if tab == self.tab1:
                 self.model.undo_changes()
+            elif tab == self.tab3:
+                self.model.undo_changes()
+                if self.map_opened:
+                    self.maps.update_3d_from_text() # show the restored map values
         elif key_sequence == "Ctrl+Y":
             if tab == self.tab1:
                 self.model.redo_changes()
+            elif tab == self.tab3:
+                self.model.redo_changes()
+                if self.map_opened:
+                    self.maps.update_3d_from_text()
         elif key_sequence == "Ctrl+C":
             if tab == self.tab1:
                 self.text_addons.copy_values(False)
@@ -369,17 +384,48 @@ class LinOLS(QMainWindow):
 
         self.entry_col.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
 
-        text_layout.addWidget(self.sel_label, 0, 0)
-        text_layout.addWidget(self.value_label, 0, 1)
-        text_layout.addWidget(arrow_label, 0, 2)
-        text_layout.addWidget(self.difference_label, 0, 3)
-        text_layout.addWidget(self.entry_shift, 0, 4)
-        text_layout.addWidget(self.entry_col, 0, 5)
+        self.load_progress = QProgressBar(self) # progress of opening a file, hidden when idle
+        self.load_progress.setFixedWidth(250)
+        self.load_progress.setStyleSheet("""
+                    font-family: 'Roboto';
+                    font-size: 12px;
+                    color: white;
+                """)
+        self.load_progress.hide()
+
+        self.btn_cancel_load = QPushButton("Cancel", self)
+        self.btn_cancel_load.clicked.connect(lambda: self.text_view_.cancel_loading())
+        self.btn_cancel_load.hide()
+
+        text_layout.addWidget(self.load_progress, 0, 0)
+        text_layout.addWidget(self.btn_cancel_load, 0, 1)
+        text_layout.addWidget(self.sel_label, 0, 2)
+        text_layout.addWidget(self.value_label, 0, 3)
+        text_layout.addWidget(arrow_label, 0, 4)
+        text_layout.addWidget(self.difference_label, 0, 5)
+        text_layout.addWidget(self.entry_shift, 0, 6)
+        text_layout.addWidget(self.entry_col, 0, 7)
 
         main_layout.addLayout(text_layout, 2, 0, 1, 2)
 
         text_layout.setAlignment(Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignRight)
 
+    def set_load_progress(self, percent, text=""): # None hides the progress bar
+        if percent is None:
+            self.load_progress.hide()
+            self.btn_cancel_load.hide()
+            return
+
+        if percent < 0:
+            self.load_progress.setRange(0, 0) # busy indicator
+        else:
+            self.load_progress.setRange(0, 100)
+            self.load_progress.setValue(percent)
+
+        self.load_progress.setFormat(text)
+        self.load_progress.show()
+        self.btn_cancel_load.show()
+
     def setup_tab1(self):
         main_layout = QGridLayout()
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -412,7 +458,7 @@ class LinOLS(QMainWindow):
         """)
 
         from ui_components.TableModel.table_model import CustomTableModel
-        self.model = CustomTableModel(self.unpacked, self)
+        self.model = CustomTableModel(self)
         self.table_view.setModel(self.model)
 
         self.table_view.horizontalHeader().setVisible(False)
@@ -588,7 +634,16 @@ class LinOLS(QMainWindow):
 
         self.canvas.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
 
+        from ui_components.Canvas_2D.canvas_2d import Canvas2D
+        self.canvas_2d = Canvas2D(self.ax, self.canvas)
+
+        from ui_components.Canvas_2D.overview_2d import Overview2D
+        self.overview_2d = Overview2D(self)
+
         self.canvas.mpl_connect("button_press_event", self.mode2d.on_canvas_click)
+        self.canvas.mpl_connect("motion_notify_event", self.mode2d.on_canvas_move)
+        self.canvas.mpl_connect("button_release_event", self.mode2d.on_canvas_release)
+        self.canvas.mpl_connect("scroll_event", self.mode2d.on_canvas_scroll)
         self.canvas.mpl_connect("key_press_event", self.mode2d.on_key_press_2d)
 
         left_grid_layout.addWidget(btn_left, 0, 0)
@@ -606,7 +661,8 @@ class LinOLS(QMainWindow):
         mid_grid_layout.addWidget(btn_plus, 0, 5)
         mid_grid_layout.addWidget(btn_percentage_2, 0, 6)
 
-        mid_grid_layout.addItem(spacer, 0, 7)
+        # a layout owns its items, the same spacer added twice is deleted twice when the window closes
+        mid_grid_layout.addItem(QSpacerItem(25, 1, QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed), 0, 7)
 
         mid_grid_layout.addWidget(self.value_btn_2d, 0, 8)
 
@@ -614,10 +670,11 @@ class LinOLS(QMainWindow):
         right_grid_layout.addWidget(btn_right, 0, 1)
 
 
-        main_layout.addWidget(self.canvas, 0, 0, 1, 2)
-        main_layout.addLayout(left_grid_layout, 1, 0, 1, 2)
-        main_layout.addLayout(mid_grid_layout, 1, 0, 1, 2)
-        main_layout.addLayout(right_grid_layout, 1, 0, 1, 2)
+        main_layout.addWidget(self.overview_2d.canvas, 0, 0, 1, 2)
+        main_layout.addWidget(self.canvas, 1, 0, 1, 2)
+        main_layout.addLayout(left_grid_layout, 2, 0, 1, 2)
+        main_layout.addLayout(mid_grid_layout, 2, 0, 1, 2)
+        main_layout.addLayout(right_grid_layout, 2, 0, 1, 2)
 
         left_grid_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
         mid_grid_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -768,8 +825,15 @@ class LinOLS(QMainWindow):
 
         self.map_list.itemDoubleClicked.connect(self.maps.on_double_click)
 
+        self.potential_map_list = QListWidget() # found maps, highest score first
+        self.potential_map_list.setStyleSheet("background-color: #333; color: white; font-size: 10pt;")
+        self.potential_map_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
+
+        self.potential_map_list.itemDoubleClicked.connect(self.maps.show_potential_map)
+
         layout = QVBoxLayout(self.tab4)
         layout.addWidget(self.map_list)
+        layout.addWidget(self.potential_map_list)
 
         self.tab4.setLayout(layout)
 
@@ -826,6 +890,14 @@ class LinOLS(QMainWindow):
         save_action.triggered.connect(self.text_view_.save_file)
         file_menu.addAction(save_action)
 
+        export_patch_action = QAction("Export Patch", self)
+        export_patch_action.triggered.connect(self.text_view_.export_patch)
+        file_menu.addAction(export_patch_action)
+
+        import_patch_action = QAction("Import Patch", self)
+        import_patch_action.triggered.connect(self.text_view_.import_patch)
+        file_menu.addAction(import_patch_action)
+
         options_menu = menubar.addMenu("Options")
 
         find_action = QAction("Find", self)
@@ -889,6 +961,7 @@ class LinOLS(QMainWindow):
             self.exit_app()
 
     def exit_app(self):
+        self.text_view_.cancel_loading(True)
         self.tk_win_manager.kill_tkinter_window()
         time.sleep(0.001)
         self.clean_up()
@@ -914,13 +987,11 @@ class CustomTableView(QTableView):
         frame_before = self.linols.current_frame
 
         index = first_visible_row * self.linols.columns
-        frame = self.linols.num_rows * self.linols.columns
-        frames_num = index // frame
-        self.linols.current_frame = frames_num * frame
+        self.linols.current_frame = self.linols.mode2d.frame_start(index)
 
         if frame_before != self.linols.current_frame:
             self.linols.sync_2d_scroll = True
-            self.linols.mode2d.draw_canvas(self.linols)
+            self.linols.redraw.request("2d")
 
     def get_first_visible_index(self):
         visible_rect = self.viewport().geometry()
@@ -949,10 +1020,7 @@ class CustomTableView(QTableView):
         super().mousePressEvent(event)
 
     def on_right_click(self, event):
-        selection_model = self.linols.table_view.selectionModel()
-        selected_indexes_count = len(selection_model.selectedIndexes())
-
-        if selected_indexes_count < 1:
+        if self.linols.text_addons.first_selected() is None:
             return
 
         right_menu = QMenu(self.parent())
@@ -1006,39 +1074,11 @@ class CustomTableView(QTableView):
             super().keyPressEvent(event)
 
     def on_f11_pressed(self):
-        selection_model = self.linols.table_view.selectionModel()
-        selected_indexes = selection_model.selectedIndexes()
-
-        temp_list = list(self.linols.current_values)
-
-        for item in selected_indexes:
-            row = item.row()
-            col = item.column()
-
-            index = (row * self.linols.columns) + col
-            index_unpacked = index - self.linols.shift_count
-
-            temp_list[index] = self.linols.unpacked[index_unpacked]
-
-        self.linols.current_values = temp_list
-
-        rows = [self.linols.current_values[i:i + self.linols.columns] for i in
-                range(0, len(self.linols.current_values) - self.linols.columns, self.linols.columns)]  # get values by rows
-
-        remaining_elements = len(self.linols.current_values) % self.linols.columns  # last row offset
-
-        if remaining_elements:
-            last_row = list(self.linols.current_values[-remaining_elements:]) + [None] * (
-                    self.linols.columns - remaining_elements)  # last row values
-            rows.append(last_row)
-
-        self.linols.model.set_data(rows)
-        self.linols.model.layoutChanged.emit()
+        indexes = self.linols.text_addons.selected_image_indexes()
 
-        self.linols.text_view_.set_labels_y_axis()
-        self.linols.text_view_.set_column_width()
+        self.linols.model.write(indexes, self.linols.image.original[indexes])
 
-        selection_model.clearSelection()
+        self.linols.table_view.selectionModel().clearSelection()
 
 class CustomListBox(QListWidget):
     def __init__(self, ui):
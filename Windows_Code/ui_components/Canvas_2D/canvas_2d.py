@@ -0,0 +1,109 @@
+import numpy as np
+from matplotlib.collections import PolyCollection
+from image_buffer.image_patch import run_indexes
+from image_buffer.image_pyramid import reduce_buckets
+
+VALUE_RANGE = 65535 # height of the plot
+
+
+class Canvas2D:
+    # artists of the 2D tab are created once and only get new data, they are drawn over a saved
+    # background of the empty plot instead of redrawing the whole figure
+    def __init__(self, ax, canvas):
+        self.ax = ax
+        self.canvas = canvas
+        self.background = None # empty plot, saved on every full draw
+
+        self.ax.axis('off')
+        self.ax.set_ylim(0, VALUE_RANGE)
+
+        self.original_line, = self.ax.plot([], [], color="white", linewidth=0.5, animated=True)
+        self.modified_line, = self.ax.plot([], [], color="red", linewidth=0.5, animated=True) # changed segments
+        self.spans = PolyCollection([], alpha=0.3, linewidth=0, animated=True) # selection, user and potential maps
+        self.ax.add_collection(self.spans)
+        self.cursor = self.ax.axvline(0, color="#bd090e", linestyle='-', visible=False, animated=True)
+
+        self.artists = (self.original_line, self.modified_line, self.spans, self.cursor)
+
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def on_draw(self, event): # full draw after a resize or the first show
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+
+    @staticmethod
+    def decimate(original, modified, changed, parts):
+        # lowest and highest value of every part drawn as a vertical stroke, no peak between two pixels is lost
+        size = -(-len(original) // parts)
+        x = np.repeat(np.arange(0, len(original), size) + (size - 1) / 2, 2)
+
+        original = np.column_stack(reduce_buckets(original, original, size)).ravel()
+        modified = np.column_stack(reduce_buckets(modified, modified, size)).ravel()
+        changed = np.repeat(reduce_buckets(changed, changed, size)[1], 2)
+        return x, original, modified, changed
+
+    @staticmethod
+    def changed_segments(x, values, changed):
+        # changed values and one value on each side, segments are split by NaN so the line has gaps
+        if not np.any(changed):
+            return np.zeros(0), np.zeros(0)
+
+        edges = np.flatnonzero(np.diff(np.r_[False, changed, False]))
+        starts = np.maximum(edges[0::2] - 1, 0)
+        stops = np.minimum(edges[1::2] + 1, len(values))
+
+        lengths = stops - starts + 1 # one more point for the gap
+        points = run_indexes(starts, lengths)
+        gaps = np.cumsum(lengths) - 1
+        points[gaps] = 0
+
+        segments_x = x[points].astype(np.float64)
+        segments_y = values[points].astype(np.float64)
+        segments_x[gaps] = np.nan
+        segments_y[gaps] = np.nan
+        return segments_x, segments_y
+
+    @staticmethod
+    def merge_spans(spans, gap):
+        # neighbouring spans of one color closer than the gap are drawn as one, they touch on the screen anyway
+        merged = []
+        for start, end, color in spans:
+            if merged and merged[-1][2] == color and 0 <= start - merged[-1][1] <= gap:
+                merged[-1] = (merged[-1][0], end, color)
+            else:
+                merged.append((start, end, color))
+        return merged
+
+    def show(self, x, original, modified, changed, spans, cursor, width):
+        # x are plot positions of the values, spans are (start, end, color) in plot positions, cursor is a
+        # plot position or None and the plot is width values wide
+        self.original_line.set_data(x, original)
+        self.modified_line.set_data(*self.changed_segments(x, modified, changed))
+
+        pixel = width / self.ax.bbox.width
+        spans = self.merge_spans(spans, pixel)
+
+        # half a pixel on each side keeps the narrowest spans visible, outlines would cost more than the fill
+        self.spans.set_verts([[(start - pixel / 2, 0), (start - pixel / 2, VALUE_RANGE),
+                               (end + pixel / 2, VALUE_RANGE), (end + pixel / 2, 0)] for start, end, color in spans])
+        colors = [color for start, end, color in spans]
+        self.spans.set_facecolor(colors)
+        self.spans.set_edgecolor(colors)
+
+        self.cursor.set_visible(cursor is not None)
+        if cursor is not None:
+            self.cursor.set_xdata([cursor, cursor])
+
+        self.ax.set_xlim(0, width)
+
+        if self.background is None:
+            self.canvas.draw() # saves the background and draws the artists
+            return
+
+        self.canvas.restore_region(self.background)
+        self.draw_artists()
+        self.canvas.blit(self.ax.bbox)
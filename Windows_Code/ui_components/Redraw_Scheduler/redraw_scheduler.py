@@ -0,0 +1,43 @@
+import time
+from PyQt6.QtCore import QTimer
+
+FRAME = 1 / 60 # seconds, views are drawn at most once in this time
+
+
+class RedrawScheduler:
+    # views are only marked dirty by requests and drawn together on the next turn of the event loop, a burst
+    # of edits, scrolls or imported maps draws once, views of hidden tabs are skipped until they are shown
+    def __init__(self, ui):
+        self.views = {} # name: draw function and function telling whether the view is shown
+        self.dirty = set()
+        self.requested = {} # name: number of requests, compared with the performed draws when profiling
+        self.performed = {} # name: number of draws
+        self.last_flush = 0
+
+        self.timer = QTimer(ui)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    def add_view(self, name, draw, visible):
+        self.views[name] = (draw, visible)
+        self.requested[name] = 0
+        self.performed[name] = 0
+
+    def request(self, name):
+        self.requested[name] += 1
+        self.dirty.add(name)
+
+        if not self.timer.isActive():
+            wait = FRAME - (time.perf_counter() - self.last_flush)
+            self.timer.start(max(int(wait * 1000), 0))
+
+    def flush(self): # draw the dirty views now, hidden views are drawn by the request of their tab
+        self.timer.stop()
+        self.last_flush = time.perf_counter()
+
+        dirty, self.dirty = self.dirty, set()
+        for name in dirty:
+            draw, visible = self.views[name]
+            if visible():
+                self.performed[name] += 1
+                draw()